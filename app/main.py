@@ -1,5 +1,8 @@
+from utils import startup
 
-from ui.init import start_init
+startup.begin()
+
+from ui.init import start_init  # noqa: E402
 
 if __name__ == "__main__":
     start_init()
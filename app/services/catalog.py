@@ -0,0 +1,270 @@
+import json
+import os
+import re
+import struct
+import sys
+from array import array
+
+from services.integrity import normalize_expected
+from services.search import normalize
+from utils.constants import *
+from utils.paths import get_cache_path, get_rom_path
+
+REQUIRED_KEYS = ("game", "name", "size")
+CHUNK_SIZE = 64 * 1024
+PAGE_SIZE = 500
+
+
+def get_catalog_path():
+    return os.path.join(get_rom_path(""), "games.json")
+
+
+def is_valid_entry(entry):
+    return (
+        isinstance(entry, dict)
+        and all(k in entry for k in REQUIRED_KEYS)
+        and isinstance(entry["name"], str)
+        and isinstance(entry["game"], str)
+    )
+
+
+def iter_json_array(f, chunk_size=CHUNK_SIZE):
+    """
+    Lê um array JSON de nível superior item a item, em blocos de `chunk_size`.
+
+    Só o item atual e o bloco lido ficam em memória; o arquivo inteiro nunca
+    é carregado de uma vez. Levanta ValueError se o conteúdo não for um array.
+    """
+    decoder = json.JSONDecoder()
+    buf, pos, eof = "", 0, False
+
+    def read_more():
+        nonlocal buf, pos, eof
+        chunk = f.read(chunk_size)
+        buf, pos = buf[pos:] + chunk, 0
+        eof = not chunk
+
+    def skip_ws():
+        nonlocal pos
+        while True:
+            while pos < len(buf) and buf[pos].isspace():
+                pos += 1
+            if pos < len(buf) or eof:
+                return
+            read_more()
+
+    skip_ws()
+    if pos >= len(buf) or buf[pos] != "[":
+        raise ValueError(INVALID_JSON)
+    pos += 1
+
+    skip_ws()
+    if pos < len(buf) and buf[pos] == "]":
+        return
+
+    while True:
+        skip_ws()
+        while True:
+            try:
+                value, end = decoder.raw_decode(buf, pos)
+                # Número no fim do bloco pode estar truncado: lê mais antes de aceitar
+                if (
+                    eof
+                    or isinstance(value, (dict, list, str))
+                    or (end < len(buf) and buf[end] not in "0123456789.eE+-")
+                ):
+                    break
+            except json.JSONDecodeError:
+                if eof:
+                    raise ValueError(INVALID_JSON)
+            read_more()
+
+        yield value
+        pos = end
+
+        skip_ws()
+        if pos >= len(buf):
+            raise ValueError(INVALID_JSON)
+        if buf[pos] == "]":
+            return
+        if buf[pos] != ",":
+            raise ValueError(INVALID_JSON)
+        pos += 1
+
+
+def iter_catalog(path=None, page_size=PAGE_SIZE):
+    """Gera páginas de entradas válidas do games.json à medida que são lidas."""
+    page = []
+    with open(path or get_catalog_path(), encoding="utf-8") as f:
+        for entry in iter_json_array(f):
+            if not is_valid_entry(entry):
+                continue
+            page.append(entry)
+            if len(page) >= page_size:
+                yield page
+                page = []
+    if page:
+        yield page
+
+
+# === Cache compilado do catálogo (cache/catalog.bin) ===
+CACHE_MAGIC = b"AX2C"
+CACHE_VERSION = 2
+_HEADER = struct.Struct("<4sHqqI")
+_COLUMNS = ("names", "links", "covers", "sizes", "keys", "sha1s", "crc32s")
+_NUMERIC = ("size_bytes", "exact_bytes")
+_SIZE_UNITS = {"B": 1, "KB": 1024, "MB": 1024**2, "GB": 1024**3, "TB": 1024**4}
+_SIZE_RE = re.compile(r"([\d.,]+)\s*([KMGT]?B)", re.IGNORECASE)
+
+
+def parse_size(text):
+    """Converte "1,2 GB" / "700 MB" em bytes (0 se não reconhecer)."""
+    match = _SIZE_RE.search(str(text or ""))
+    if not match:
+        return 0
+    try:
+        value = float(match.group(1).replace(",", "."))
+    except ValueError:
+        return 0
+    return int(value * _SIZE_UNITS[match.group(2).upper()])
+
+
+class Catalog:
+    """
+    Catálogo em colunas: uma lista por campo em vez de um dict por jogo.
+
+    Strings repetidas (tamanho, capa vazia) são internadas, o tamanho também
+    fica numérico e a chave de busca normalizada já vem pronta. Os campos
+    opcionais de verificação ("bytes", "sha1", "crc32") ficam vazios/0 quando
+    ausentes. `entry(i)` monta o dict só para as linhas que a loja exibe.
+    """
+
+    __slots__ = _COLUMNS + _NUMERIC
+
+    def __init__(self):
+        self.names = []
+        self.links = []
+        self.covers = []
+        self.sizes = []
+        self.keys = []
+        self.sha1s = []
+        self.crc32s = []
+        self.size_bytes = array("q")
+        self.exact_bytes = array("q")
+
+    def __len__(self):
+        return len(self.names)
+
+    def append(self, entry):
+        self.names.append(entry["name"])
+        self.links.append(entry["game"])
+        self.covers.append(sys.intern(entry.get("cover", "") or ""))
+        self.sizes.append(sys.intern(str(entry["size"])))
+        self.keys.append(normalize(entry["name"]))
+        self.size_bytes.append(parse_size(entry["size"]))
+        expected = normalize_expected(entry)
+        self.sha1s.append(sys.intern(expected["sha1"]))
+        self.crc32s.append(sys.intern(expected["crc32"]))
+        self.exact_bytes.append(expected["bytes"])
+
+    def extend(self, other):
+        for column in self.__slots__:
+            getattr(self, column).extend(getattr(other, column))
+
+    def entry(self, index):
+        return {
+            "name": self.names[index],
+            "game": self.links[index],
+            "cover": self.covers[index],
+            "size": self.sizes[index],
+            "size_bytes": self.size_bytes[index],
+            "bytes": self.exact_bytes[index],
+            "sha1": self.sha1s[index],
+            "crc32": self.crc32s[index],
+        }
+
+    # === Serialização ===
+    def to_bytes(self, src_mtime, src_size):
+        parts = [_HEADER.pack(CACHE_MAGIC, CACHE_VERSION, src_mtime, src_size, len(self))]
+        for column in _COLUMNS:
+            blob = "\0".join(getattr(self, column)).encode("utf-8")
+            parts += [struct.pack("<I", len(blob)), blob]
+        parts += [getattr(self, column).tobytes() for column in _NUMERIC]
+        return b"".join(parts)
+
+    @classmethod
+    def from_bytes(cls, data, src_mtime, src_size):
+        magic, version, mtime, size, count = _HEADER.unpack_from(data)
+        if (magic, version, mtime, size) != (CACHE_MAGIC, CACHE_VERSION, src_mtime, src_size):
+            return None
+
+        catalog = cls()
+        offset = _HEADER.size
+        for column in _COLUMNS:
+            (length,) = struct.unpack_from("<I", data, offset)
+            offset += 4
+            values = data[offset : offset + length].decode("utf-8").split("\0") if count else []
+            offset += length
+            if column in ("covers", "sizes", "sha1s", "crc32s"):
+                values = [sys.intern(v) for v in values]
+            setattr(catalog, column, values)
+        for column in _NUMERIC:
+            getattr(catalog, column).frombytes(data[offset : offset + count * 8])
+            offset += count * 8
+
+        if any(len(getattr(catalog, c)) != count for c in catalog.__slots__):
+            return None
+        return catalog
+
+
+def _source_stamp(path):
+    st = os.stat(path)
+    return st.st_mtime_ns, st.st_size
+
+
+def load_cached_catalog(path=None):
+    """Lê cache/catalog.bin com uma única leitura se ainda bater com o games.json."""
+    path = path or get_catalog_path()
+    try:
+        mtime, size = _source_stamp(path)
+        with open(get_cache_path("catalog.bin"), "rb") as f:
+            data = f.read()
+        return Catalog.from_bytes(data, mtime, size)
+    except (OSError, struct.error, UnicodeDecodeError, ValueError):
+        return None
+
+
+def save_cached_catalog(catalog, path=None):
+    path = path or get_catalog_path()
+    try:
+        mtime, size = _source_stamp(path)
+        cache_path = get_cache_path("catalog.bin")
+        tmp_path = cache_path + ".tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(catalog.to_bytes(mtime, size))
+        os.replace(tmp_path, cache_path)
+    except OSError as e:
+        print(f"[WARN] Falha ao salvar cache do catálogo: {e}")
+
+
+def iter_catalog_pages(path=None, page_size=PAGE_SIZE):
+    """
+    Gera o catálogo em páginas `Catalog`.
+
+    Com o cache válido, sai tudo numa página só; caso contrário o games.json
+    é lido em streaming e o cache é regravado no final.
+    """
+    path = path or get_catalog_path()
+    cached = load_cached_catalog(path)
+    if cached is not None:
+        yield cached
+        return
+
+    full = Catalog()
+    for entries in iter_catalog(path, page_size):
+        page = Catalog()
+        for entry in entries:
+            page.append(entry)
+        full.extend(page)
+        yield page
+    save_cached_catalog(full, path)
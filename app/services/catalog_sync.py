@@ -0,0 +1,133 @@
+import io
+import json
+import os
+import zipfile
+
+from services.catalog import get_catalog_path, is_valid_entry, iter_catalog
+from services.http_client import get_client
+from services.transfer import INTERACTIVE, transfer_scheduler
+from utils.config import get_config
+from utils.paths import get_cache_path
+
+STATE_FILE = "catalog_sync.json"
+CHUNK_SIZE = 64 * 1024
+
+
+def _load_state():
+    try:
+        with open(get_cache_path(STATE_FILE), encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _save_state(state):
+    with open(get_cache_path(STATE_FILE), "w", encoding="utf-8") as f:
+        json.dump(state, f)
+
+
+def _write_catalog(games):
+    path = get_catalog_path()
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(games, f, ensure_ascii=False)
+    os.replace(tmp_path, path)
+
+
+def _decode_payload(body):
+    # O catálogo padrão vem como games.zip (com games.json dentro)
+    if body[:2] == b"PK":
+        with zipfile.ZipFile(io.BytesIO(body)) as z:
+            name = next(n for n in z.namelist() if n.lower().endswith("games.json"))
+            body = z.read(name)
+    return json.loads(body.decode("utf-8-sig"))
+
+
+def apply_delta(delta):
+    """Aplica {"added", "removed", "changed"} (por nome) ao games.json local."""
+    games = {}
+    if os.path.exists(get_catalog_path()):
+        for page in iter_catalog():
+            for entry in page:
+                games[entry["name"]] = entry
+
+    for name in delta.get("removed", []):
+        games.pop(name, None)
+    for entry in delta.get("added", []) + delta.get("changed", []):
+        if is_valid_entry(entry):
+            games[entry["name"]] = entry
+
+    _write_catalog(list(games.values()))
+
+
+def sync_catalog(progress_callback=None, url=None, full=False):
+    """
+    Sincroniza o games.json com a URL configurada em config.json ("catalog.url").
+
+    Envia If-None-Match / If-Modified-Since (304 = nada mudou) e, quando já
+    existe uma versão local, `?since=<versão>` para o servidor poder responder
+    só com o delta {"version", "base", "added", "removed", "changed"}. Também
+    aceita o catálogo completo (lista, {"version", "games"} ou games.zip).
+    Retorna "unchanged", "delta" ou "full".
+    """
+    config = get_config("catalog")
+    url = url or config["url"]
+    state = _load_state()
+    if state.get("url") != url or not os.path.exists(get_catalog_path()):
+        state = {}
+
+    headers = {}
+    params = {}
+    if not full:
+        if state.get("etag"):
+            headers["If-None-Match"] = state["etag"]
+        if state.get("last_modified"):
+            headers["If-Modified-Since"] = state["last_modified"]
+        if state.get("version") is not None:
+            params["since"] = state["version"]
+
+    with transfer_scheduler.open(INTERACTIVE) as transfer, get_client().get(
+        url, headers=headers, params=params, stream=True, timeout=config.get("timeout", 30)
+    ) as r:
+        if r.status_code == 304:
+            return "unchanged"
+        r.raise_for_status()
+
+        total = int(r.headers.get("content-length", 0))
+        body = bytearray()
+        for chunk in r.iter_content(CHUNK_SIZE):
+            body.extend(chunk)
+            transfer.throttle(len(chunk))
+            if progress_callback and total > 0:
+                progress_callback(min(len(body) / total, 1.0))
+
+        etag = r.headers.get("ETag")
+        last_modified = r.headers.get("Last-Modified")
+
+    payload = _decode_payload(bytes(body))
+
+    if isinstance(payload, dict) and any(k in payload for k in ("added", "removed", "changed")):
+        if payload.get("base") != state.get("version"):
+            if full:
+                # Pedido sem `since` e o servidor ainda mandou delta: não há o que aplicar
+                raise ValueError("Servidor respondeu com delta ao pedir o catálogo completo.")
+            # Delta para outra versão: busca o catálogo completo
+            return sync_catalog(progress_callback, url, full=True)
+        apply_delta(payload)
+        result = "delta"
+    else:
+        games = payload.get("games") if isinstance(payload, dict) else payload
+        if not isinstance(games, list):
+            raise ValueError("Catálogo remoto em formato inválido.")
+        _write_catalog([g for g in games if is_valid_entry(g)])
+        result = "full"
+
+    _save_state(
+        {
+            "url": url,
+            "etag": etag,
+            "last_modified": last_modified,
+            "version": payload.get("version") if isinstance(payload, dict) else None,
+        }
+    )
+    return result
@@ -0,0 +1,109 @@
+import itertools
+import queue
+import threading
+
+from utils.thumbnails import get_card_image
+
+
+class CoverRequest:
+    def __init__(self, image, size, callback):
+        self.image = image
+        self.size = size
+        self.callback = callback
+        self.cancelled = False
+
+    def cancel(self):
+        self.cancelled = True
+
+
+class CoverLoader:
+    """
+    Pool de threads que decodifica/compõe as capas fora da thread do Tk.
+
+    Pedidos saem por ordem de prioridade (posição no grid) e podem ser
+    cancelados quando o card é reciclado ou destruído. Os resultados voltam
+    por uma fila drenada com `after`, então os callbacks rodam na thread do Tk.
+    """
+
+    def __init__(self, workers=4, poll_ms=30):
+        self.workers = workers
+        self.poll_ms = poll_ms
+        self._jobs = queue.PriorityQueue()
+        self._results = queue.Queue()
+        self._seq = itertools.count()
+        self._threads = []
+        self._root = None
+        self._primed = {}
+        self._lock = threading.Lock()
+
+    def attach(self, widget):
+        """Liga a entrega dos resultados ao mainloop da janela do widget."""
+        root = widget.winfo_toplevel()
+        if self._root is root:
+            return
+        self._root = root
+        self._start_workers()
+        root.after(self.poll_ms, self._pump)
+
+    def prime(self, image, size, composed):
+        """Deixa uma capa já composta (aquecimento do splash) para uso imediato."""
+        with self._lock:
+            self._primed[(image, tuple(size))] = composed
+
+    def take_primed(self, image, size):
+        with self._lock:
+            return self._primed.pop((image, tuple(size)), None)
+
+    def request(self, image, size, callback, priority=0):
+        # Capa pré-composta: entrega na hora (quem pede já está na thread do Tk)
+        composed = self.take_primed(image, size)
+        if composed is not None:
+            callback(composed)
+            return None
+
+        req = CoverRequest(image, size, callback)
+        self._jobs.put((priority, next(self._seq), req))
+        return req
+
+    # === Workers ===
+    def _start_workers(self):
+        while len(self._threads) < self.workers:
+            thread = threading.Thread(target=self._work, daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def _work(self):
+        while True:
+            _, _, req = self._jobs.get()
+            if req.cancelled:
+                continue
+            try:
+                composed = get_card_image(req.image, req.size)
+            except Exception as e:
+                print(f"[WARN] Falha ao carregar capa '{req.image}': {e}")
+                composed = None
+            self._results.put((req, composed))
+
+    # === Entrega na thread do Tk ===
+    def _pump(self):
+        root = self._root
+        try:
+            while True:
+                req, composed = self._results.get_nowait()
+                if req.cancelled or composed is None:
+                    continue
+                try:
+                    req.callback(composed)
+                except Exception as e:
+                    print(f"[WARN] Falha ao aplicar capa '{req.image}': {e}")
+        except queue.Empty:
+            pass
+
+        try:
+            if root is self._root and root.winfo_exists():
+                root.after(self.poll_ms, self._pump)
+        except Exception:
+            pass
+
+
+cover_loader = CoverLoader()
@@ -1,10 +1,28 @@
+import json
 import os
+import queue
 import re
-import subprocess
-import tempfile
+import shutil
 import threading
+import time
+from html.parser import HTMLParser
+from urllib.parse import parse_qs, urlparse
 
-from utils.paths import get_cover_path, get_rom_path
+from services.http_client import get_client
+from services.installed import installed_games
+from services.integrity import (
+    IntegrityError,
+    StreamHasher,
+    normalize_expected,
+    verify_download,
+)
+from services.library import record_verification
+from services.transfer import BULK, INTERACTIVE, TransferYield, transfer_scheduler
+from utils.config import get_config
+from utils.paths import get_cache_path, get_cover_path, get_rom_path
+
+# Nomes com download em andamento (linhas recicladas da loja consultam aqui)
+active_downloads = set()
 
 
 def normalize_name(texto: str):
@@ -13,11 +31,21 @@ def normalize_name(texto: str):
     return texto.strip() or "Jogo"
 
 
+def staging_dir():
+    # Temporários ficam fora de /roms e /covers: o LibraryWatcher não vê cada gravação
+    path = get_cache_path("downloads")
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
 def cleanup_files(base_nome):
-    # Remove CHD e capa se download for cancelado ou falhar.
+    # Remove CHD, capa e temporários se download for cancelado ou falhar.
     caminhos = [
         os.path.join(get_rom_path(""), f"{base_nome}.chd"),
+        os.path.join(staging_dir(), f"{base_nome}.chd.download"),
+        os.path.join(staging_dir(), f"{base_nome}.chd.part"),
         os.path.join(get_cover_path(""), f"{base_nome}.png"),
+        os.path.join(staging_dir(), f"{base_nome}.png.download"),
     ]
     for caminho in caminhos:
         try:
@@ -27,128 +55,661 @@ def cleanup_files(base_nome):
             pass
 
 
-def download_game(jogo, botao, update_log, refresh_callback, linha, icon_check):
+# ==================================
+# 🌐 Fontes (Google Drive, HTTP simples)
+# ==================================
+class DownloadCancelled(Exception):
+    pass
+
+
+def _get(url, headers=None, timeout=30, priority=INTERACTIVE, **kwargs):
+    # Arquivos vêm sem compressão: tamanho e Range precisam bater com o disco
+    headers = {"Accept-Encoding": "identity", **(headers or {})}
+    response = get_client().get(
+        url, headers=headers, stream=True, timeout=timeout, priority=priority, **kwargs
+    )
+    try:
+        response.raise_for_status()
+    except Exception:
+        response.close()
+        raise
+    return response
+
+
+class HttpSource:
+    """Fonte HTTP/HTTPS simples; outras fontes só precisam resolver `open`."""
+
+    def matches(self, url):
+        return urlparse(url).scheme in ("http", "https")
+
+    def open(self, url, headers=None, timeout=30, priority=INTERACTIVE):
+        return _get(url, headers, timeout, priority)
+
+    def open_range(self, url, start, end, timeout=30, priority=INTERACTIVE):
+        """Pede bytes [start, end] da URL já resolvida por `open`."""
+        response = _get(url, {"Range": f"bytes={start}-{end}"}, timeout, priority)
+        if response.status_code != 206:
+            response.close()
+            raise IOError("Servidor ignorou o pedido de Range.")
+        return response
+
+
+def _content_total(response):
+    # "Content-Range: bytes 0-99/1234" -> 1234
+    content_range = response.headers.get("content-range", "")
+    if "/" in content_range:
+        total = content_range.rsplit("/", 1)[1]
+        return int(total) if total.isdigit() else 0
+    return int(response.headers.get("content-length", 0))
+
+
+class _FormParser(HTMLParser):
+    def __init__(self):
+        super().__init__()
+        self.action = None
+        self.fields = {}
+
+    def handle_starttag(self, tag, attrs):
+        attrs = dict(attrs)
+        if tag == "form" and self.action is None:
+            self.action = attrs.get("action")
+        elif tag == "input" and attrs.get("type") == "hidden" and attrs.get("name"):
+            self.fields[attrs["name"]] = attrs.get("value", "")
+
+
+class GoogleDriveSource(HttpSource):
+    """Links do Drive (/file/d/<id>, ?id=<id>), inclusive a página de confirmação de arquivo grande."""
+
+    DOWNLOAD_URL = "https://drive.usercontent.google.com/download"
+
+    def matches(self, url):
+        return "drive.google.com" in url or "drive.usercontent.google.com" in url
+
+    @staticmethod
+    def file_id(url):
+        match = re.search(r"/d/([\w-]+)", url)
+        if match:
+            return match.group(1)
+        ids = parse_qs(urlparse(url).query).get("id")
+        if ids:
+            return ids[0]
+        raise ValueError(f"Link do Google Drive inválido: {url}")
+
+    def open(self, url, headers=None, timeout=30, priority=INTERACTIVE):
+        params = {"id": self.file_id(url), "export": "download", "confirm": "t"}
+        response = _get(self.DOWNLOAD_URL, headers, timeout, priority, params=params)
+
+        # Arquivo grande: o Drive devolve um formulário de confirmação em HTML
+        if "text/html" in response.headers.get("content-type", ""):
+            form = _FormParser()
+            form.feed(response.text)
+            response.close()
+            if not form.fields:
+                raise ValueError("Google Drive não liberou o download (cota ou permissão).")
+            response = _get(
+                form.action or self.DOWNLOAD_URL, headers, timeout, priority, params=form.fields
+            )
+        return response
+
+
+SOURCES = [GoogleDriveSource(), HttpSource()]
+
 
-    def run():
-        nome = jogo.get("name", "Jogo")
-        link_chd = jogo.get("game", "")
-        capa_link = jogo.get("cover", "")
-        base_nome = normalize_name(nome)
+def register_source(source):
+    """Registra uma fonte extra; fontes registradas têm prioridade."""
+    SOURCES.insert(0, source)
 
+
+def resolve_source(url):
+    for source in SOURCES:
+        if source.matches(url):
+            return source
+    raise ValueError(f"Nenhuma fonte suporta o link: {url}")
+
+
+# ==================================
+# 📥 Fila de downloads
+# ==================================
+class DownloadJob:
+    def __init__(self, job_id, name, url, dest, expected=None, priority=BULK):
+        self.id = job_id
+        self.name = name
+        self.url = url
+        self.dest = dest
+        self.expected = expected or {}
+        self.priority = priority
+        self.transfer = None
+        self.hasher = None
+        self.verified = None
+        self.status = "queued"
+        self.downloaded = 0
+        self.total = 0
+        self.attempts = 0
+        self.error = None
+        self._cancel = threading.Event()
+        self._running = threading.Event()
+        self._running.set()
+
+    @property
+    def temp_path(self):
+        return os.path.join(staging_dir(), os.path.basename(self.dest) + ".download")
+
+    @property
+    def part_path(self):
+        return os.path.join(staging_dir(), os.path.basename(self.dest) + ".part")
+
+    @property
+    def progress(self):
+        return self.downloaded / self.total if self.total else 0.0
+
+    def cancel(self):
+        self._cancel.set()
+        self._running.set()
+
+    def pause(self):
+        self._running.clear()
+
+    def resume(self):
+        self._running.set()
+
+    def checkpoint(self):
+        """Chamado entre blocos: segura enquanto pausado e aborta se cancelado."""
+        self._running.wait()
+        if self._cancel.is_set():
+            raise DownloadCancelled()
+
+
+# ==================================
+# 🧩 Download segmentado (Range) com retomada
+# ==================================
+class SegmentedTransfer:
+    """
+    Baixa um arquivo em N conexões paralelas com pedidos de Range.
+
+    O destino `.download` é pré-alocado no tamanho final e cada conexão
+    escreve no seu trecho. O `.part` (JSON) guarda os segmentos
+    [início, fim, bytes prontos] e é regravado periodicamente, então um
+    download interrompido (erro, fechamento do app, queda) continua de onde
+    parou. Conexões que terminam cedo dividem o maior segmento restante.
+    O bloco que chega exatamente no fim do trecho já hasheado entra direto
+    no hash; só trechos que terminaram fora de ordem (ou de uma sessão
+    anterior) são relidos do disco com `catch_up`.
+    """
+
+    def __init__(self, manager, job, source, url, total):
+        config = get_config("downloads")
+        self.manager = manager
+        self.job = job
+        self.source = source
+        self.url = url
+        self.total = total
+        self.connections = config["segments"]
+        self.min_segment = config["min_segment_size"]
+        self.segments = []
+        self._lock = threading.Lock()
+        self._hash_lock = threading.Lock()
+        self._save_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._errors = []
+        self._unassigned = []
+
+    def run(self):
+        job = self.job
+        self.segments = self._load_part() or self._allocate()
+        job.total = self.total
+        job.downloaded = self._done()
+        job.hasher = StreamHasher()
+
+        pending = [seg for seg in self.segments if self._remaining(seg) > 0]
+        while len(pending) < self.connections:
+            seg = self._split()
+            if seg is None:
+                break
+            pending.append(seg)
+        # Retomada pode trazer mais trechos que conexões: o excedente espera na fila
+        self._unassigned = pending[self.connections :]
+
+        threads = [
+            threading.Thread(target=self._worker, args=(seg,), daemon=True)
+            for seg in pending[: self.connections]
+        ]
+        for thread in threads:
+            thread.start()
+
+        while threads:
+            threads[0].join(self.manager.progress_interval)
+            threads = [thread for thread in threads if thread.is_alive()]
+            job.downloaded = self._done()
+            self._catch_up(self._contiguous())
+            self._save_part()
+            self.manager._emit(job, "progress")
+
+        job.downloaded = self._done()
+        self._save_part()
+        if self._errors:
+            raise self._errors[0]
+        if job.downloaded != self.total:
+            raise IOError(f"Download incompleto: {job.downloaded}/{self.total} bytes")
+        self._catch_up(self.total)
+        os.remove(job.part_path)
+
+    def _catch_up(self, upto):
+        with self._hash_lock:
+            self.job.hasher.catch_up(self.job.temp_path, upto)
+
+    def _hash_chunk(self, pos, chunk):
+        # Bloco em ordem: hash sem reler do disco. Se o que vem antes acabou
+        # de ficar completo, alcança até aqui e segue em ordem a partir deste bloco.
+        with self._hash_lock:
+            hasher = self.job.hasher
+            if hasher.offset < pos and self._contiguous() >= pos:
+                hasher.catch_up(self.job.temp_path, pos)
+            if hasher.offset == pos:
+                hasher.update(chunk)
+
+    # === Estado (.part) ===
+    def _load_part(self):
+        job = self.job
         try:
-            linha.after(0, lambda: botao.configure(state="disabled"))
+            with open(job.part_path, encoding="utf-8") as f:
+                state = json.load(f)
+            if (
+                state.get("url") == job.url
+                and state.get("total") == self.total
+                and os.path.getsize(job.temp_path) == self.total
+            ):
+                return [list(seg) for seg in state["segments"]]
+        except (OSError, ValueError, KeyError, TypeError):
+            pass
+        return None
+
+    def _allocate(self):
+        # Pré-aloca o arquivo final e divide em segmentos iguais
+        with open(self.job.temp_path, "wb") as f:
+            f.truncate(self.total)
+        count = max(1, min(self.connections, self.total // self.min_segment))
+        step = -(-self.total // count)
+        segments = [
+            [start, min(start + step, self.total) - 1, 0] for start in range(0, self.total, step)
+        ]
+        self.segments = segments
+        self._save_part()
+        return segments
+
+    def _save_part(self):
+        # Workers e o laço de progresso gravam; um de cada vez, sempre o estado mais novo
+        tmp_path = self.job.part_path + ".tmp"
+        with self._save_lock:
+            with self._lock:
+                state = {"url": self.job.url, "total": self.total, "segments": self.segments}
+                data = json.dumps(state)
+            try:
+                with open(tmp_path, "w", encoding="utf-8") as f:
+                    f.write(data)
+                os.replace(tmp_path, self.job.part_path)
+            except OSError as e:
+                print(f"[WARN] Falha ao salvar progresso de {self.job.name}: {e}")
+
+    def _done(self):
+        with self._lock:
+            return sum(seg[2] for seg in self.segments)
 
-            rom_dir = os.path.abspath(get_rom_path(""))
-            capa_dir = os.path.abspath(get_cover_path(""))
+    def _contiguous(self):
+        # Fim do trecho já completo a partir do byte 0 (até onde dá para hashear)
+        pos = 0
+        with self._lock:
+            for seg in sorted(self.segments):
+                if seg[0] != pos:
+                    break
+                pos = seg[0] + seg[2]
+                if self._remaining(seg) > 0:
+                    break
+        return pos
 
-            os.makedirs(rom_dir, exist_ok=True)
-            os.makedirs(capa_dir, exist_ok=True)
+    @staticmethod
+    def _remaining(seg):
+        return seg[1] - seg[0] + 1 - seg[2]
 
-            destino_final = os.path.join(rom_dir, f"{base_nome}.chd")
-            os.path.join(capa_dir, f"{base_nome}.png")
+    def _next_segment(self):
+        with self._lock:
+            if self._unassigned:
+                return self._unassigned.pop(0)
+        return self._split()
 
-            # === Centralizar CMD ===
+    def _split(self):
+        # Divide o maior segmento restante ao meio para uma conexão livre
+        with self._lock:
+            seg = max(self.segments, key=self._remaining, default=None)
+            if seg is None or self._remaining(seg) < 2 * self.min_segment:
+                return None
+            pos = seg[0] + seg[2]
+            mid = pos + self._remaining(seg) // 2
+            new = [mid, seg[1], 0]
+            seg[1] = mid - 1
+            self.segments.append(new)
+            return new
+
+    # === Conexões ===
+    def _worker(self, seg):
+        try:
+            while seg is not None and not self._stop.is_set():
+                self._fetch(seg)
+                seg = self._next_segment()
+        except Exception as e:
+            self._errors.append(e)
+            self._stop.set()
+        finally:
+            # Grava até onde este trecho chegou antes de sair (erro ou parada)
+            self._save_part()
+
+    def _fetch(self, seg):
+        job = self.job
+        while self._remaining(seg) > 0 and not self._stop.is_set():
+            offset = seg[0] + seg[2]
             try:
-                import tkinter as tk
-
-                root = tk.Tk()
-                root.withdraw()
-                screen_w = root.winfo_screenwidth()
-                screen_h = root.winfo_screenheight()
-                root.destroy()
-            except Exception:
-                screen_w, screen_h = 1280, 720
-
-            cols, lines = 90, 25
-            px_w, px_h = cols * 9, lines * 16
-            (screen_w - px_w) // 2
-            (screen_h - px_h) // 2
-
-            # === Criar script .BAT completo ===
-            script_path = os.path.join(tempfile.gettempdir(), f"download_{base_nome}.bat")
-            with open(script_path, "w", encoding="utf-8") as f:
-                f.write(
-                    f"""@echo off
-chcp 65001 >nul
-title Baixando {nome}
-mode con: cols={cols} lines={lines}
-color 0A
-
-echo =====================================================
-echo   🎮 Baixando: {nome}
-echo =====================================================
-echo.
-cd /d "{rom_dir}"
-
-echo Baixando jogo principal (.CHD)...
-python -m gdown "{link_chd}" -O "{destino_final}" --fuzzy --no-cookies
-if not exist "{destino_final}" (
-    echo [ERRO] Falha no download do jogo.
-    pause
-    exit /b 1
-)
-"""
-                )
+                with self.source.open_range(
+                    self.url, offset, seg[1], self.manager.timeout, job.priority
+                ) as response, open(job.temp_path, "r+b", buffering=0) as f:
+                    f.seek(offset)
+                    pos = offset
+                    for chunk in response.iter_content(self.manager.chunk_size):
+                        job.checkpoint()
+                        with self._lock:
+                            chunk = chunk[: self._remaining(seg)]
+                        if not chunk:
+                            break  # segmento encurtado por _split
+                        _write_all(f, chunk)
+                        self._hash_chunk(pos, chunk)
+                        pos += len(chunk)
+                        with self._lock:
+                            seg[2] = min(seg[2] + len(chunk), seg[1] - seg[0] + 1)
+                        if self._stop.is_set():
+                            return  # outro trecho falhou: o bloco em mãos já foi gravado
+                        job.transfer.throttle(len(chunk))
+            except TransferYield:
+                # Vaga devolvida a uma interativa: reabre o Range de onde parou
+                job.transfer.wait_turn(job._cancel.is_set)
+                continue
+            if self._remaining(seg) > 0 and not self._stop.is_set():
+                raise IOError(f"Conexão encerrada antes do fim do segmento de {job.name}")
 
-                # === Baixar capa dentro do CMD ===
-                if capa_link:
-                    f.write(
-                        f"""
-echo.
-echo Baixando capa...
-cd /d "{capa_dir}"
-python -m gdown "{capa_link}" -O "{base_nome}.png" --fuzzy --no-cookies
-if not exist "{base_nome}.png" (
-    echo [ERRO] Falha ao baixar capa.
-    pause
-    exit /b 1
-)
-cd /d "{rom_dir}"
-"""
-                    )
-
-                f.write(
-                    """
-echo.
-echo =====================================================
-echo ✅ Jogo e capa baixados com sucesso!
-echo =====================================================
-timeout /t 2 >nul
-exit /b 0
-"""
-                )
 
-            # === Executar CMD e aguardar ===
-            cmd_command = f'start /WAIT "" cmd /c "{script_path}"'
-            processo = subprocess.Popen(
-                cmd_command, shell=True, creationflags=subprocess.CREATE_NEW_CONSOLE
+def _write_all(f, data):
+    # Escrita sem buffer: o que entra no .part já foi entregue ao sistema
+    view = memoryview(data)
+    while view:
+        view = view[f.write(view) :]
+
+
+class DownloadManager:
+    """
+    Gerenciador de downloads em processo: fila, N downloads em paralelo,
+    progresso por bytes, pausa/cancelamento e novas tentativas com backoff.
+
+    Eventos são entregues a `callback(job, event)` na thread do worker:
+    queued, started, progress, retry, done, failed, cancelled.
+
+    Jobs interativos (capas) não esperam na fila dos downloads em massa:
+    rodam numa thread própria e a banda é dividida pelo TransferScheduler.
+    """
+
+    def __init__(self, parallel=None):
+        config = get_config("downloads")
+        self.parallel = parallel or config["parallel"]
+        self.retries = config["retries"]
+        self.backoff = config["backoff"]
+        self.chunk_size = config["chunk_size"]
+        self.timeout = config["timeout"]
+        self.progress_interval = config["progress_interval"]
+        self.job_rate = get_config("transfers")["job_rate"]
+
+        self._queue = queue.Queue()
+        self._next_id = 0
+        self._jobs = {}
+        self._callbacks = {}
+        self._listeners = []
+        self._workers = []
+        self._lock = threading.Lock()
+
+    def add_listener(self, callback):
+        self._listeners.append(callback)
+
+    def submit(self, name, url, dest, callback=None, expected=None, priority=BULK):
+        """`expected` ({"bytes", "sha1", "crc32"}) é conferido antes de mover o arquivo."""
+        with self._lock:
+            self._next_id += 1
+            job = DownloadJob(self._next_id, name, url, dest, expected, priority)
+            self._jobs[job.id] = job
+            if callback:
+                self._callbacks[job.id] = callback
+            while len(self._workers) < self.parallel:
+                worker = threading.Thread(target=self._work, daemon=True)
+                worker.start()
+                self._workers.append(worker)
+        self._emit(job, "queued")
+        if priority == INTERACTIVE:
+            threading.Thread(target=self._start, args=(job,), daemon=True).start()
+        else:
+            self._queue.put(job)
+        return job
+
+    def jobs(self):
+        with self._lock:
+            return list(self._jobs.values())
+
+    def find(self, name):
+        return next(
+            (j for j in self.jobs() if j.name == name and j.status in ("queued", "running")),
+            None,
+        )
+
+    def cancel(self, name):
+        job = self.find(name)
+        if job:
+            job.cancel()
+        return job
+
+    # === Worker ===
+    def _emit(self, job, event):
+        for callback in [self._callbacks.get(job.id)] + self._listeners:
+            if callback:
+                try:
+                    callback(job, event)
+                except Exception as e:
+                    print(f"[WARN] Callback de download falhou: {e}")
+
+    def _work(self):
+        while True:
+            self._start(self._queue.get())
+
+    def _start(self, job):
+        if job._cancel.is_set():
+            job.status = "cancelled"
+            self._finish(job, "cancelled")
+            return
+        rate = self.job_rate if job.priority == BULK else 0
+        with transfer_scheduler.open(job.priority, rate) as transfer:
+            job.transfer = transfer
+            self._run(job)
+
+    def _run(self, job):
+        job.status = "running"
+        self._emit(job, "started")
+
+        while True:
+            job.attempts += 1
+            try:
+                self._transfer(job)
+                job.verified = verify_download(job.temp_path, job.hasher, job.expected)
+                # cache/ pode estar em outro volume que /roms
+                shutil.move(job.temp_path, job.dest)
+                job.status = "done"
+                self._finish(job, "done")
+                return
+            except TransferYield:
+                # Fluxo sem Range cedeu a vaga: recomeça sem gastar tentativa
+                job.attempts -= 1
+                job.transfer.wait_turn(job._cancel.is_set)
+            except DownloadCancelled:
+                self._remove_temp(job)
+                job.status = "cancelled"
+                self._finish(job, "cancelled")
+                return
+            except Exception as e:
+                job.error = e
+                if isinstance(e, IntegrityError):
+                    # Conteúdo ruim: descarta o parcial e baixa de novo do zero
+                    self._remove_temp(job)
+                if job.attempts > self.retries:
+                    # Com .part o parcial fica no disco para retomar depois
+                    if not os.path.exists(job.part_path):
+                        self._remove_temp(job)
+                    job.status = "failed"
+                    self._finish(job, "failed")
+                    return
+                self._emit(job, "retry")
+                delay = self.backoff * (2 ** (job.attempts - 1))
+                if job._cancel.wait(delay):
+                    continue  # cancelado durante a espera: checkpoint aborta
+
+    def _transfer(self, job):
+        job.checkpoint()
+        source = resolve_source(job.url)
+
+        # Sondagem com Range: 206 + tamanho conhecido habilita segmentos e retomada
+        with source.open(
+            job.url, headers={"Range": "bytes=0-"}, timeout=self.timeout, priority=job.priority
+        ) as response:
+            total = _content_total(response)
+            if response.status_code != 206 or not total:
+                self._remove_part(job)
+                self._stream(job, response)
+                return
+            direct_url = response.url
+
+        SegmentedTransfer(self, job, source, direct_url, total).run()
+
+    def _stream(self, job, response):
+        # Servidor sem Range: um único fluxo, sem retomada
+        job.downloaded = 0
+        job.total = int(response.headers.get("content-length", 0))
+        job.hasher = StreamHasher()
+        last_event = 0.0
+        with open(job.temp_path, "wb") as f:
+            for chunk in response.iter_content(self.chunk_size):
+                job.checkpoint()
+                if not chunk:
+                    continue
+                f.write(chunk)
+                job.hasher.update(chunk)
+                job.downloaded += len(chunk)
+                job.transfer.throttle(len(chunk))
+                now = time.monotonic()
+                if now - last_event >= self.progress_interval:
+                    last_event = now
+                    self._emit(job, "progress")
+
+        if job.total and job.downloaded != job.total:
+            raise IOError(f"Download incompleto: {job.downloaded}/{job.total} bytes")
+
+    def _remove_temp(self, job):
+        self._remove_part(job)
+        try:
+            if os.path.exists(job.temp_path):
+                os.remove(job.temp_path)
+        except OSError:
+            pass
+
+    def _remove_part(self, job):
+        try:
+            if os.path.exists(job.part_path):
+                os.remove(job.part_path)
+        except OSError:
+            pass
+
+    def _finish(self, job, event):
+        self._emit(job, event)
+        with self._lock:
+            self._callbacks.pop(job.id, None)
+            self._jobs.pop(job.id, None)
+
+
+download_manager = DownloadManager()
+
+
+# ==================================
+# 🎮 Download de jogo (CHD + capa) para a loja
+# ==================================
+def _format_progress(job):
+    if not job.total:
+        return f"{job.downloaded / 1024**2:.0f} MB"
+    return (
+        f"{job.progress * 100:.0f}% "
+        f"({job.downloaded / 1024**3:.2f}/{job.total / 1024**3:.2f} GB)"
+    )
+
+
+def download_game(jogo, update_log, refresh_callback, linha):
+
+    def refresh_row():
+        # A linha pode ter sido reciclada para outro jogo enquanto baixava
+        if getattr(linha, "name", nome) == nome:
+            linha.refresh_state()
+
+    def ui(callback):
+        linha.after(0, callback)
+
+    nome = jogo.get("name", "Jogo")
+    link_chd = jogo.get("game", "")
+    capa_link = jogo.get("cover", "")
+    base_nome = normalize_name(nome)
+
+    rom_dir = os.path.abspath(get_rom_path(""))
+    capa_dir = os.path.abspath(get_cover_path(""))
+    destino_final = os.path.join(rom_dir, f"{base_nome}.chd")
+    destino_capa = os.path.join(capa_dir, f"{base_nome}.png")
+
+    def finished():
+        active_downloads.discard(nome)
+        installed_games.add(os.path.basename(destino_final))
+        ui(
+            lambda: (
+                update_log(f"Instalação concluída: {nome}"),
+                refresh_row(),
+                refresh_callback() if refresh_callback else None,
             )
-            processo.wait()
-
-            # === Após CMD ===
-            if os.path.exists(destino_final):
-                linha.after(
-                    0,
-                    lambda: (
-                        update_log(f"Instalação concluída: {nome}"),
-                        botao.configure(state="disabled", image=icon_check),
-                        refresh_callback() if refresh_callback else None,
-                    ),
+        )
+
+    def on_cover(job, event):
+        # Capa é opcional: falha não desfaz a instalação do jogo
+        if event in ("done", "failed", "cancelled"):
+            finished()
+
+    def on_game(job, event):
+        if event == "progress":
+            ui(lambda: update_log(f"Baixando {nome}: {_format_progress(job)}"))
+        elif event == "retry":
+            ui(lambda: update_log(f"Tentando novamente ({job.attempts}): {nome}"))
+        elif event == "done":
+            record_verification(destino_final, job.verified, job.hasher.sha1_hex())
+            if capa_link:
+                download_manager.submit(
+                    f"{nome} (capa)", capa_link, destino_capa, on_cover, priority=INTERACTIVE
                 )
             else:
-                cleanup_files(base_nome)
-                linha.after(
-                    0,
-                    lambda: (
-                        update_log(f"Falha ao instalar {nome}."),
-                        botao.configure(state="normal"),
-                    ),
-                )
-
-        except Exception:
+                finished()
+        elif event == "failed":
+            # Parcial (.download + .part) fica no disco: o próximo clique retoma
+            active_downloads.discard(nome)
+            ui(lambda: (update_log(f"Falha ao instalar: {nome}. {job.error}"), refresh_row()))
+        elif event == "cancelled":
+            active_downloads.discard(nome)
             cleanup_files(base_nome)
-            linha.after(
-                0, lambda: (update_log("Erro ao baixar jogo."), botao.configure(state="normal"))
-            )
+            ui(lambda: (update_log(f"Download cancelado: {nome}."), refresh_row()))
 
-    threading.Thread(target=run, daemon=True).start()
+    active_downloads.add(nome)
+    refresh_row()
+    update_log(f"Na fila: {nome}")
+    return download_manager.submit(
+        nome, link_chd, destino_final, on_game, expected=normalize_expected(jogo)
+    )
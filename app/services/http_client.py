@@ -0,0 +1,221 @@
+import threading
+import time
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+from services.transfer import BULK, INTERACTIVE, TransferYield
+from utils.config import get_config
+
+
+class HostStats:
+    __slots__ = ("requests", "errors", "bytes", "latency", "transfer_time")
+
+    def __init__(self):
+        self.requests = 0
+        self.errors = 0
+        self.bytes = 0
+        self.latency = 0.0  # soma do tempo até os cabeçalhos
+        self.transfer_time = 0.0  # soma do tempo lendo o corpo
+
+    def as_dict(self):
+        done = max(self.requests - self.errors, 1)
+        return {
+            "requests": self.requests,
+            "errors": self.errors,
+            "bytes": self.bytes,
+            "latency_ms": round(self.latency / done * 1000, 1),
+            "throughput_bps": int(self.bytes / self.transfer_time) if self.transfer_time else 0,
+        }
+
+
+class HostSlots:
+    """
+    Vagas de conexão de um host, com prioridade.
+
+    Com mais de uma vaga, os downloads em massa nunca ocupam a última:
+    ela fica reservada para capas/catálogo. Interativas na espera passam
+    na frente das em massa e `contended()` avisa os fluxos em massa
+    abertos para devolverem a vaga.
+    """
+
+    def __init__(self, limit):
+        self.limit = max(1, limit)
+        self.bulk_limit = max(1, self.limit - 1)
+        self.in_use = 0
+        self.bulk_in_use = 0
+        self.waiting = 0  # interativas esperando vaga
+        self._cond = threading.Condition()
+
+    def acquire(self, priority):
+        with self._cond:
+            if priority == BULK:
+                while (
+                    self.in_use >= self.limit
+                    or self.bulk_in_use >= self.bulk_limit
+                    or self.waiting
+                ):
+                    self._cond.wait()
+                self.bulk_in_use += 1
+            else:
+                self.waiting += 1
+                try:
+                    while self.in_use >= self.limit:
+                        self._cond.wait()
+                finally:
+                    self.waiting -= 1
+            self.in_use += 1
+
+    def release(self, priority):
+        with self._cond:
+            self.in_use -= 1
+            if priority == BULK:
+                self.bulk_in_use -= 1
+            self._cond.notify_all()
+
+    def contended(self):
+        return self.waiting > 0
+
+
+class HttpClient:
+    """
+    Cliente HTTP único do app (emulador, catálogo, capas e ROMs).
+
+    Uma `requests.Session` com pool de conexões e keep-alive, timeouts e
+    proxies vindos do config.json ("http"), compressão gzip por padrão e
+    limite de conexões simultâneas por host (HostSlots, com prioridade).
+    A vaga do host fica ocupada até a resposta ser fechada
+    (`with client.get(...) as r:`); um fluxo em massa que segura a vaga
+    enquanto uma interativa espera levanta TransferYield ao ler o corpo.
+    Contadores de latência e vazão por host ficam em `stats()`.
+    """
+
+    def __init__(self, config=None):
+        config = config or get_config("http")
+        self.timeout = (config["connect_timeout"], config["read_timeout"])
+        self.per_host = config["per_host"]
+        self.host_limits = config["hosts"]
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=config["pool_connections"],
+            pool_maxsize=config["pool_maxsize"],
+        )
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self.session.headers.update(
+            {"User-Agent": config["user_agent"], "Accept-Encoding": "gzip, deflate"}
+        )
+        if config["proxies"]:
+            self.session.proxies.update(config["proxies"])
+
+        self._slots = {}
+        self._stats = {}
+        self._lock = threading.Lock()
+
+    # === Limites e contadores por host ===
+    def _host(self, url):
+        return urlparse(url).netloc.lower()
+
+    def _slot(self, host):
+        with self._lock:
+            slot = self._slots.get(host)
+            if slot is None:
+                slot = HostSlots(self.host_limits.get(host, self.per_host))
+                self._slots[host] = slot
+            return slot
+
+    def _host_stats(self, host):
+        with self._lock:
+            return self._stats.setdefault(host, HostStats())
+
+    def stats(self):
+        with self._lock:
+            return {host: s.as_dict() for host, s in self._stats.items()}
+
+    # === Requisições ===
+    def get(self, url, **kwargs):
+        return self.request("GET", url, **kwargs)
+
+    def request(self, method, url, timeout=None, stream=False, priority=INTERACTIVE, **kwargs):
+        host = self._host(url)
+        slot = self._slot(host)
+        stats = self._host_stats(host)
+        if isinstance(timeout, (int, float)):
+            timeout = (self.timeout[0], timeout)
+
+        slot.acquire(priority)
+        released = False
+
+        def release():
+            nonlocal released
+            if not released:
+                released = True
+                slot.release(priority)
+
+        started = time.monotonic()
+        try:
+            response = self.session.request(
+                method, url, timeout=timeout or self.timeout, stream=stream, **kwargs
+            )
+        except Exception:
+            release()
+            with self._lock:
+                stats.requests += 1
+                stats.errors += 1
+            raise
+
+        with self._lock:
+            stats.requests += 1
+            stats.latency += time.monotonic() - started
+            if response.status_code >= 400:
+                stats.errors += 1
+
+        if not stream:
+            with self._lock:
+                stats.bytes += len(response.content)
+            release()
+            return response
+
+        self._instrument(response, stats, release, slot if priority == BULK else None)
+        return response
+
+    def _instrument(self, response, stats, release, bulk_slot=None):
+        # Corpo lido em streaming: conta bytes/tempo e libera a vaga ao fechar
+        iter_content = response.iter_content
+        close = response.close
+
+        def counted_iter_content(*args, **kwargs):
+            last = time.monotonic()
+            for chunk in iter_content(*args, **kwargs):
+                if bulk_slot is not None and bulk_slot.contended():
+                    # Interativa esperando a vaga: quem lê fecha a resposta e repete depois
+                    raise TransferYield()
+                now = time.monotonic()
+                with self._lock:
+                    stats.bytes += len(chunk)
+                    stats.transfer_time += now - last
+                last = now
+                yield chunk
+
+        def counted_close():
+            try:
+                close()
+            finally:
+                release()
+
+        response.iter_content = counted_iter_content
+        response.close = counted_close
+
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def get_client():
+    """Cliente compartilhado, criado no primeiro uso."""
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = HttpClient()
+        return _client
@@ -0,0 +1,67 @@
+import os
+import threading
+
+from services.library import add_listener, list_games
+from services.search import normalize
+
+
+class InstalledGames:
+    """
+    Conjunto compartilhado dos jogos instalados, para a loja consultar em O(1).
+
+    A chave é o nome normalizado (sem acento, caixa ou pontuação), então
+    "Jogo.chd", "Jogo.iso" e o nome salvo por `normalize_name` batem com o
+    nome do catálogo. É montado uma vez a partir do índice da biblioteca e
+    acompanha os deltas de `update_library`, downloads e exclusões.
+    """
+
+    def __init__(self):
+        self._files = None  # chave -> arquivos de ROM (ex.: .cue + .bin)
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(name: str):
+        return normalize(name)
+
+    def _ensure(self):
+        if self._files is None:
+            self.refresh()
+        return self._files
+
+    def refresh(self):
+        files = {}
+        for game in list_games():
+            files.setdefault(self.key(game["title"]), set()).add(game["file"])
+        with self._lock:
+            self._files = files
+
+    def __contains__(self, name: str):
+        return self.key(name) in self._ensure()
+
+    def add(self, file: str):
+        files = self._ensure()
+        with self._lock:
+            files.setdefault(self.key(os.path.splitext(file)[0]), set()).add(file)
+
+    def discard(self, name: str):
+        files = self._ensure()
+        with self._lock:
+            files.pop(self.key(name), None)
+
+    def apply_delta(self, delta):
+        if self._files is None:
+            return
+        with self._lock:
+            for game in delta["added"]:
+                self._files.setdefault(self.key(game["title"]), set()).add(game["file"])
+            for file in delta["removed"]:
+                k = self.key(os.path.splitext(file)[0])
+                remaining = self._files.get(k)
+                if remaining is not None:
+                    remaining.discard(file)
+                    if not remaining:
+                        del self._files[k]
+
+
+installed_games = InstalledGames()
+add_listener(installed_games.apply_delta)
@@ -0,0 +1,140 @@
+import hashlib
+import os
+import struct
+import zlib
+
+READ_SIZE = 1024 * 1024
+
+# === Cabeçalho CHD v5 (big-endian, 124 bytes) ===
+CHD_MAGIC = b"MComprHD"
+CHD_V5_HEADER = struct.Struct(">8sII4IQQQII20s20s20s")
+
+
+class IntegrityError(Exception):
+    pass
+
+
+class StreamHasher:
+    """
+    SHA-1 + CRC32 calculados na mesma passada da escrita.
+
+    Blocos chegam em ordem por `update`; no download segmentado só o que
+    chegou fora de ordem é lido de volta com `catch_up` (ainda no cache de
+    páginas do SO).
+    """
+
+    def __init__(self):
+        self.sha1 = hashlib.sha1()
+        self.crc32 = 0
+        self.offset = 0
+
+    def update(self, data):
+        self.sha1.update(data)
+        self.crc32 = zlib.crc32(data, self.crc32)
+        self.offset += len(data)
+
+    def catch_up(self, path, upto):
+        if upto <= self.offset:
+            return
+        with open(path, "rb") as f:
+            f.seek(self.offset)
+            while self.offset < upto:
+                data = f.read(min(READ_SIZE, upto - self.offset))
+                if not data:
+                    break
+                self.update(data)
+
+    def sha1_hex(self):
+        return self.sha1.hexdigest()
+
+    def crc32_hex(self):
+        return f"{self.crc32 & 0xFFFFFFFF:08x}"
+
+
+def normalize_expected(entry):
+    """Extrai {"bytes", "sha1", "crc32"} opcionais de uma entrada do catálogo."""
+    try:
+        size = int(entry.get("bytes") or 0)
+    except (TypeError, ValueError):
+        size = 0
+    sha1 = str(entry.get("sha1") or "").strip().lower()
+    crc32 = entry.get("crc32") or ""
+    if isinstance(crc32, int):
+        crc32 = f"{crc32 & 0xFFFFFFFF:08x}"
+    crc32 = str(crc32).strip().lower().removeprefix("0x").zfill(8) if crc32 else ""
+    return {"bytes": max(size, 0), "sha1": sha1, "crc32": crc32}
+
+
+def check_chd_header(path):
+    """
+    Confere o cabeçalho CHD: assinatura, versão e, na v5, tamanho do
+    cabeçalho, SHA-1 interno preenchido e offsets do mapa/metadados dentro
+    do arquivo (pega arquivos truncados). Validar o SHA-1 interno em si
+    exigiria descomprimir todas as hunks.
+    """
+    size = os.path.getsize(path)
+    with open(path, "rb") as f:
+        data = f.read(CHD_V5_HEADER.size)
+
+    if len(data) < 16 or data[:8] != CHD_MAGIC:
+        raise IntegrityError("Arquivo CHD sem assinatura válida.")
+    header_len, version = struct.unpack_from(">II", data, 8)
+    if version not in (3, 4, 5):
+        raise IntegrityError(f"Versão de CHD não suportada: {version}.")
+    if version < 5:
+        return
+
+    if len(data) < CHD_V5_HEADER.size or header_len != CHD_V5_HEADER.size:
+        raise IntegrityError("Cabeçalho CHD v5 incompleto.")
+    fields = CHD_V5_HEADER.unpack(data)
+    logical_bytes, map_offset, meta_offset, hunk_bytes, unit_bytes = fields[7:12]
+    sha1 = fields[13]
+
+    if not logical_bytes or not hunk_bytes or not unit_bytes:
+        raise IntegrityError("Cabeçalho CHD v5 com tamanhos zerados.")
+    if not (CHD_V5_HEADER.size <= map_offset < size) or meta_offset >= size:
+        raise IntegrityError("Arquivo CHD truncado (mapa fora do arquivo).")
+    if not any(sha1):
+        raise IntegrityError("Cabeçalho CHD v5 sem SHA-1.")
+
+
+def verify_download(path, hasher, expected):
+    """
+    Valida o arquivo baixado contra o esperado do catálogo.
+
+    Retorna "verified" quando algum hash conferiu, "header" quando o
+    catálogo não tem hash e só o tamanho/cabeçalho puderam ser checados e
+    "unchecked" sem nada a checar; levanta IntegrityError se não bater.
+    """
+    expected = expected or {}
+    size = os.path.getsize(path)
+    if expected.get("bytes") and size != expected["bytes"]:
+        raise IntegrityError(f"Tamanho incorreto: {size} de {expected['bytes']} bytes.")
+
+    verified = False
+    if expected.get("sha1") or expected.get("crc32"):
+        # Hash pedido nunca cai para a checagem só de cabeçalho: o que o
+        # hasher não viu em ordem é lido do disco (ou tudo, se ele não serve)
+        if hasher is None or hasher.offset > size:
+            hasher = StreamHasher()
+        hasher.catch_up(path, size)
+        if hasher.offset != size:
+            raise IntegrityError(
+                f"Arquivo mudou durante a verificação ({hasher.offset} de {size} bytes)."
+            )
+        if expected.get("sha1"):
+            if hasher.sha1_hex() != expected["sha1"]:
+                raise IntegrityError("SHA-1 não confere com o catálogo.")
+            verified = True
+        if expected.get("crc32"):
+            if hasher.crc32_hex() != expected["crc32"]:
+                raise IntegrityError("CRC32 não confere com o catálogo.")
+            verified = True
+
+    checked = bool(expected.get("bytes"))
+    if path.lower().endswith((".chd", ".chd.download")):
+        check_chd_header(path)
+        checked = True
+    if verified:
+        return "verified"
+    return "header" if checked else "unchecked"
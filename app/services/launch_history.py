@@ -0,0 +1,132 @@
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+
+from utils.paths import get_cache_path
+
+PHASES = ("discovery", "rom_check", "spawn", "first_frame", "controller")
+HISTORY_LIMIT = 200  # lançamentos guardados por jogo
+
+_lock = threading.Lock()
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS launches (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    game TEXT NOT NULL,
+    started_at REAL NOT NULL,
+    outcome TEXT NOT NULL,
+    discovery_ms REAL,
+    rom_check_ms REAL,
+    spawn_ms REAL,
+    first_frame_ms REAL,
+    controller_ms REAL,
+    total_ms REAL
+);
+CREATE INDEX IF NOT EXISTS launches_game ON launches (game, id);
+"""
+
+
+@contextmanager
+def connect():
+    """Histórico de lançamentos (cache/launches.db), separado do índice da biblioteca."""
+    conn = sqlite3.connect(get_cache_path("launches.db"), timeout=10)
+    conn.row_factory = sqlite3.Row
+    try:
+        conn.executescript(_SCHEMA)
+        yield conn
+    finally:
+        conn.close()
+
+
+class LaunchTrace:
+    """
+    Tempos de um lançamento, do clique ao primeiro quadro do emulador.
+
+    Cada fase vira um span em ms (`with trace.span("spawn"):` ou `add`);
+    `total` é do clique até a primeira janela/linha de saída do PCSX2.
+    `finish` grava uma única vez no histórico.
+    """
+
+    def __init__(self, game):
+        self.game = game
+        self.started_at = time.time()
+        self._t0 = time.perf_counter()
+        self.spans = {}
+        self.total = None
+        self.outcome = None
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def span(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(name, (time.perf_counter() - start) * 1000)
+
+    def add(self, name, ms):
+        with self._lock:
+            self.spans.setdefault(name, ms)
+
+    def mark_first_frame(self):
+        with self._lock:
+            if self.total is None:
+                self.total = (time.perf_counter() - self._t0) * 1000
+
+    def finish(self, outcome="ok"):
+        with self._lock:
+            if self.outcome is not None:
+                return
+            self.outcome = outcome
+        record_launch(self)
+        phases = " ".join(
+            f"{name}={self.spans[name]:.0f}ms" for name in PHASES if name in self.spans
+        )
+        total = f"{self.total:.0f}ms" if self.total is not None else "-"
+        print(f"[LAUNCH] {self.game}: total={total} {phases} ({outcome})")
+
+
+def record_launch(trace):
+    values = [trace.spans.get(name) for name in PHASES]
+    try:
+        with _lock, connect() as conn, conn:
+            conn.execute(
+                "INSERT INTO launches (game, started_at, outcome, discovery_ms, rom_check_ms, "
+                "spawn_ms, first_frame_ms, controller_ms, total_ms) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                [trace.game, trace.started_at, trace.outcome, *values, trace.total],
+            )
+            conn.execute(
+                "DELETE FROM launches WHERE game = ? AND id NOT IN "
+                "(SELECT id FROM launches WHERE game = ? ORDER BY id DESC LIMIT ?)",
+                (trace.game, trace.game, HISTORY_LIMIT),
+            )
+    except sqlite3.Error as e:
+        print(f"[WARN] Falha ao gravar histórico de lançamento: {e}")
+
+
+def _percentile(values, pct):
+    # Interpolação linear entre os vizinhos (mesma regra do numpy padrão)
+    values = sorted(values)
+    if not values:
+        return None
+    pos = (len(values) - 1) * pct / 100
+    low = int(pos)
+    high = min(low + 1, len(values) - 1)
+    return values[low] + (values[high] - values[low]) * (pos - low)
+
+
+def launch_stats(game, percentiles=(50, 90, 99)):
+    """Percentis por fase dos lançamentos bem-sucedidos de um jogo: {fase: {"p50": ms...}}."""
+    columns = PHASES + ("total",)
+    with connect() as conn:
+        rows = conn.execute(
+            "SELECT * FROM launches WHERE game = ? AND outcome = 'ok'", (game,)
+        ).fetchall()
+
+    stats = {"count": len(rows)}
+    for name in columns:
+        values = [row[f"{name}_ms"] for row in rows if row[f"{name}_ms"] is not None]
+        stats[name] = {f"p{pct}": _percentile(values, pct) for pct in percentiles}
+    return stats
@@ -0,0 +1,254 @@
+import os
+import sqlite3
+import threading
+from contextlib import contextmanager
+
+from services.search import SearchIndex
+from utils.paths import get_cache_path, get_cover_path, get_rom_path
+
+ROM_EXTENSIONS = (".bin", ".iso", ".img", ".cue", ".chd")
+DEFAULT_COVER = "default.png"
+
+# Reentrante: connect() cria o schema sob o mesmo lock que update_library já segura
+_lock = threading.RLock()
+_schema_ready = False
+_listeners = []
+
+# Incrementar ao mudar o schema: o índice é só cache e é recriado do zero
+# (a tabela verification não é cache e sobrevive à troca de versão)
+SCHEMA_VERSION = 3
+
+_SCHEMA = """
+DROP TABLE IF EXISTS games;
+DROP TABLE IF EXISTS meta;
+CREATE TABLE games (
+    file TEXT PRIMARY KEY,
+    title TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    mtime INTEGER NOT NULL,
+    cover TEXT NOT NULL,
+    cover_mtime INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+
+# Resultado das verificações de download: não dá para recalcular a partir do disco
+_VERIFICATION_SCHEMA = """
+CREATE TABLE IF NOT EXISTS verification (
+    file TEXT PRIMARY KEY,
+    size INTEGER NOT NULL,
+    mtime INTEGER NOT NULL,
+    status TEXT NOT NULL,
+    sha1 TEXT NOT NULL DEFAULT ''
+);
+"""
+
+
+@contextmanager
+def connect():
+    """Abre o índice da biblioteca (cache/library.db) e fecha ao final."""
+    global _schema_ready
+    conn = sqlite3.connect(get_cache_path("library.db"), timeout=10)
+    conn.row_factory = sqlite3.Row
+    conn.create_function("py_lower", 1, lambda s: s.lower() if s else "", deterministic=True)
+    try:
+        if not _schema_ready:
+            # Aquecimento e watcher abrem as primeiras conexões ao mesmo tempo
+            with _lock:
+                if not _schema_ready:
+                    if conn.execute("PRAGMA user_version").fetchone()[0] != SCHEMA_VERSION:
+                        conn.executescript(_SCHEMA + f"PRAGMA user_version = {SCHEMA_VERSION};")
+                    conn.executescript(_VERIFICATION_SCHEMA)
+                    _schema_ready = True
+        yield conn
+    finally:
+        conn.close()
+
+
+def _dir_mtime(path):
+    try:
+        return str(os.stat(path).st_mtime_ns)
+    except OSError:
+        return ""
+
+
+def _to_game(row):
+    return {
+        "title": row["title"],
+        "file": row["file"],
+        "image": row["cover"],
+        "size": row["size"],
+        "mtime": row["mtime"],
+        "cover_mtime": row["cover_mtime"],
+    }
+
+
+def _with_verified(row):
+    game = _to_game(row)
+    game["verified"] = row["verified"] or ""
+    return game
+
+
+# Status só vale para o mesmo tamanho/mtime do arquivo verificado
+_GAMES_QUERY = """
+SELECT g.*, v.status AS verified FROM games g
+LEFT JOIN verification v ON v.file = g.file AND v.size = g.size AND v.mtime = g.mtime
+"""
+
+
+def empty_delta():
+    return {"added": [], "removed": [], "changed": []}
+
+
+def add_listener(callback):
+    """Registra callback(delta) chamado após cada update_library com mudanças."""
+    if callback not in _listeners:
+        _listeners.append(callback)
+
+
+def update_library(force=False):
+    """
+    Sincroniza o índice com /roms e /covers.
+
+    Só percorre os diretórios quando o mtime de algum deles mudou (ou com
+    force=True) e compara tamanho/mtime de cada ROM com o que já está salvo.
+    Retorna o delta {"added", "removed", "changed"} aplicado.
+    """
+    rom_dir = get_rom_path("")
+    cover_dir = get_cover_path("")
+    delta = empty_delta()
+
+    with _lock, connect() as conn:
+        meta = {row["key"]: row["value"] for row in conn.execute("SELECT key, value FROM meta")}
+        roms_mtime = _dir_mtime(rom_dir)
+        covers_mtime = _dir_mtime(cover_dir)
+
+        if (
+            not force
+            and meta.get("roms_mtime") == roms_mtime
+            and meta.get("covers_mtime") == covers_mtime
+        ):
+            return delta
+
+        covers = {}
+        with os.scandir(cover_dir) as it:
+            for e in it:
+                if e.name.lower().endswith(".png"):
+                    try:
+                        covers[e.name] = e.stat().st_mtime_ns
+                    except OSError:
+                        continue
+
+        existing = {row["file"]: row for row in conn.execute("SELECT * FROM games")}
+        seen = set()
+
+        with os.scandir(rom_dir) as it:
+            for entry in it:
+                if not entry.name.lower().endswith(ROM_EXTENSIONS):
+                    continue
+                try:
+                    if not entry.is_file():
+                        continue
+                    st = entry.stat()
+                except OSError:
+                    continue
+
+                title = os.path.splitext(entry.name)[0]
+                cover = f"{title}.png" if f"{title}.png" in covers else DEFAULT_COVER
+                game = {
+                    "title": title,
+                    "file": entry.name,
+                    "image": cover,
+                    "size": st.st_size,
+                    "mtime": st.st_mtime_ns,
+                    "cover_mtime": covers.get(cover, 0),
+                }
+                seen.add(entry.name)
+
+                old = existing.get(entry.name)
+                if old is None:
+                    delta["added"].append(game)
+                elif _to_game(old) != game:
+                    delta["changed"].append(game)
+
+        delta["removed"] = [f for f in existing if f not in seen]
+
+        with conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO games (file, title, size, mtime, cover, cover_mtime) "
+                "VALUES (:file, :title, :size, :mtime, :image, :cover_mtime)",
+                delta["added"] + delta["changed"],
+            )
+            conn.executemany("DELETE FROM games WHERE file = ?", [(f,) for f in delta["removed"]])
+            conn.executemany(
+                "INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)",
+                [("roms_mtime", roms_mtime), ("covers_mtime", covers_mtime)],
+            )
+
+    if any(delta.values()):
+        for callback in list(_listeners):
+            try:
+                callback(delta)
+            except Exception as e:
+                print(f"[WARN] Listener da biblioteca falhou: {e}")
+    return delta
+
+
+def invalidate_library():
+    """Força a próxima update_library a varrer tudo (ex.: capa sobrescrita no lugar)."""
+    with _lock, connect() as conn, conn:
+        conn.execute("DELETE FROM meta")
+
+
+def list_games(term=""):
+    """Lê os jogos direto do índice, filtrando pelo título (sem acessar o disco)."""
+    term = term.lower().strip()
+    with connect() as conn:
+        if term:
+            rows = conn.execute(
+                _GAMES_QUERY + "WHERE instr(py_lower(g.title), ?) > 0 "
+                "ORDER BY g.title COLLATE NOCASE",
+                (term,),
+            )
+        else:
+            rows = conn.execute(_GAMES_QUERY + "ORDER BY g.title COLLATE NOCASE")
+        return [_with_verified(row) for row in rows]
+
+
+def get_games(files):
+    """Lê só os jogos dados (ex.: os de um delta), com o status de verificação."""
+    files = list(files)
+    games = []
+    with connect() as conn:
+        # Em lotes: o SQLite limita a quantidade de parâmetros por consulta
+        for start in range(0, len(files), 500):
+            chunk = files[start : start + 500]
+            rows = conn.execute(
+                _GAMES_QUERY + f"WHERE g.file IN ({', '.join('?' * len(chunk))})", chunk
+            )
+            games.extend(_with_verified(row) for row in rows)
+    return games
+
+
+def library_index(games):
+    """Índice de busca da biblioteca, atualizável pelos deltas (por arquivo)."""
+    return SearchIndex(
+        games, ident=lambda game: game["file"], sort_key=lambda game: game["title"].lower()
+    )
+
+
+def record_verification(path, status, sha1=""):
+    """Guarda o resultado da verificação do download ("verified", "header"...)."""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return
+    with _lock, connect() as conn, conn:
+        conn.execute(
+            "INSERT OR REPLACE INTO verification (file, size, mtime, status, sha1) "
+            "VALUES (?, ?, ?, ?, ?)",
+            (os.path.basename(path), st.st_size, st.st_mtime_ns, status, sha1 or ""),
+        )
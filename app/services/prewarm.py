@@ -0,0 +1,205 @@
+import os
+import re
+import struct
+import threading
+import time
+
+from services.integrity import CHD_MAGIC, CHD_V5_HEADER
+from utils.config import get_config
+
+READ_CHUNK = 1024 * 1024
+# Cabeçalho + descritores de volume do ISO9660 (setor 16 em diante)
+HEADER_BYTES = 64 * 1024
+# ROM aquecida há pouco continua no cache; não relê a cada hover
+WARM_TTL = 300
+_CUE_FILE = re.compile(r'^\s*FILE\s+"?(.+?)"?\s+\w+\s*$', re.IGNORECASE)
+
+
+def prewarm_settings(path):
+    """Config de pré-aquecimento para a ROM, com o override da pasta mais específica."""
+    config = get_config("prewarm")
+    settings = {key: value for key, value in config.items() if key != "roots"}
+    target = os.path.normcase(os.path.abspath(path))
+    best = ""
+    for root, override in (config.get("roots") or {}).items():
+        root = os.path.normcase(os.path.abspath(root))
+        inside = target == root or target.startswith(root.rstrip(os.sep) + os.sep)
+        if inside and len(root) > len(best):
+            best = root
+            settings = {**settings, **override}
+    return settings
+
+
+def warm_ranges(path, first_bytes):
+    """Trechos (offset, tamanho) que o PCSX2 lê primeiro: cabeçalho, mapa do CHD e início."""
+    size = os.path.getsize(path)
+    ranges = [(0, min(max(first_bytes, HEADER_BYTES), size))]
+    if path.lower().endswith(".chd"):
+        chd_map = _chd_map_range(path, size)
+        if chd_map:
+            ranges.append(chd_map)
+    return ranges
+
+
+def _chd_map_range(path, size):
+    # Mapa v5: comprimido tem um cabeçalho de 16 bytes com o tamanho; cru são 4 bytes por hunk
+    with open(path, "rb") as f:
+        data = f.read(CHD_V5_HEADER.size)
+        if len(data) < CHD_V5_HEADER.size or data[:8] != CHD_MAGIC:
+            return None
+        fields = CHD_V5_HEADER.unpack(data)
+        if fields[2] != 5:
+            return None
+        compressor, logical_bytes = fields[3], fields[7]
+        map_offset, hunk_bytes = fields[8], fields[10]
+        if not hunk_bytes or not (CHD_V5_HEADER.size <= map_offset < size):
+            return None
+        if compressor:
+            f.seek(map_offset)
+            map_header = f.read(4)
+            if len(map_header) < 4:
+                return None
+            length = 16 + struct.unpack(">I", map_header)[0]
+        else:
+            length = -(-logical_bytes // hunk_bytes) * 4
+    return map_offset, min(length, size - map_offset)
+
+
+def rom_files(path):
+    """Arquivos de dados da ROM (.cue aponta para os .bin ao lado)."""
+    if not path.lower().endswith(".cue"):
+        return [path]
+    folder = os.path.dirname(path)
+    files = []
+    try:
+        with open(path, encoding="utf-8", errors="ignore") as f:
+            for line in f:
+                match = _CUE_FILE.match(line)
+                if match:
+                    files.append(os.path.join(folder, match.group(1)))
+    except OSError:
+        pass
+    return [f for f in files if os.path.exists(f)] or [path]
+
+
+class PrewarmResult:
+    def __init__(self, path, bytes_warmed, seconds, method, completed):
+        self.path = path
+        self.bytes = bytes_warmed
+        self.seconds = seconds
+        self.method = method
+        self.completed = completed
+
+    def __str__(self):
+        status = "" if self.completed else ", interrompido"
+        return (
+            f"{os.path.basename(self.path)}: {self.bytes / (1024 * 1024):.1f} MB "
+            f"em {self.seconds * 1000:.0f} ms ({self.method}{status})"
+        )
+
+
+class Prewarmer:
+    """
+    Puxa o início da ROM para o cache do sistema antes do PCSX2 abrir o disco.
+
+    Com `os.posix_fadvise` pede WILLNEED ao kernel (não bloqueia); no
+    Windows lê os trechos em sequência numa thread, descartando os dados.
+    Só um aquecimento roda por vez: pedir outra ROM cancela o atual, e a
+    mesma ROM aquecida há menos de WARM_TTL segundos é ignorada.
+    """
+
+    def __init__(self):
+        self.last_result = None
+        self._lock = threading.Lock()
+        self._current = None  # (path, cancel Event, thread)
+        self._warmed = {}  # path -> (mtime_ns, quando terminou)
+
+    def warm(self, path):
+        """Dispara o aquecimento em segundo plano; retorna a thread (ou None se não precisa)."""
+        settings = prewarm_settings(path)
+        if not settings.get("enabled") or not os.path.exists(path):
+            return None
+
+        with self._lock:
+            if self._current and self._current[0] == path and self._current[2].is_alive():
+                return self._current[2]
+            if self._is_fresh(path):
+                return None
+            if self._current:
+                self._current[1].set()
+
+            cancel = threading.Event()
+            thread = threading.Thread(
+                target=self._run, args=(path, settings, cancel), daemon=True
+            )
+            self._current = (path, cancel, thread)
+        thread.start()
+        return thread
+
+    def cancel(self):
+        with self._lock:
+            if self._current:
+                self._current[1].set()
+
+    def _is_fresh(self, path):
+        warmed = self._warmed.get(path)
+        try:
+            mtime = os.stat(path).st_mtime_ns
+        except OSError:
+            return False
+        return bool(warmed) and warmed[0] == mtime and time.monotonic() - warmed[1] < WARM_TTL
+
+    def _run(self, path, settings, cancel):
+        first_bytes = int(settings.get("first_mb", 0)) * 1024 * 1024
+        start = time.perf_counter()
+        total = 0
+        method = "fadvise" if hasattr(os, "posix_fadvise") else "leitura"
+        completed = True
+        try:
+            for data_file in rom_files(path):
+                for offset, length in warm_ranges(data_file, first_bytes):
+                    warmed, completed = _warm_range(data_file, offset, length, cancel)
+                    total += warmed
+                    if not completed:
+                        break
+                if not completed:
+                    break
+        except OSError as e:
+            print(f"[WARN] Falha ao pré-aquecer '{path}': {e}")
+            return
+
+        result = PrewarmResult(path, total, time.perf_counter() - start, method, completed)
+        with self._lock:
+            self.last_result = result
+            if completed:
+                self._warmed[path] = (os.stat(path).st_mtime_ns, time.monotonic())
+            if self._current and self._current[1] is cancel:
+                self._current = None
+        print(f"[PREWARM] {result}")
+
+
+def _warm_range(path, offset, length, cancel):
+    """Aquece um trecho; retorna (bytes, completou)."""
+    if length <= 0:
+        return 0, True
+    fd = os.open(path, os.O_RDONLY | getattr(os, "O_BINARY", 0))
+    try:
+        if hasattr(os, "posix_fadvise"):
+            os.posix_fadvise(fd, offset, length, os.POSIX_FADV_WILLNEED)
+            return length, True
+
+        os.lseek(fd, offset, os.SEEK_SET)
+        done = 0
+        while done < length:
+            if cancel.is_set():
+                return done, False
+            data = os.read(fd, min(READ_CHUNK, length - done))
+            if not data:
+                break
+            done += len(data)
+        return done, True
+    finally:
+        os.close(fd)
+
+
+prewarmer = Prewarmer()
@@ -0,0 +1,182 @@
+import bisect
+import re
+import unicodedata
+
+_NON_WORD = re.compile(r"[^0-9a-z]+")
+
+
+def normalize(text: str):
+    """Minúsculas, sem acentos e com pontuação virando espaço ("Pokémon: X" -> "pokemon x")."""
+    text = unicodedata.normalize("NFKD", text or "")
+    text = "".join(c for c in text if not unicodedata.combining(c)).casefold()
+    return _NON_WORD.sub(" ", text).strip()
+
+
+def _trigrams(text: str):
+    return {text[i : i + 3] for i in range(len(text) - 2)}
+
+
+class SearchIndex:
+    """
+    Índice de busca pré-computado (chaves normalizadas + trigramas).
+
+    Cada palavra da busca com 3+ letras restringe os candidatos pela
+    interseção das listas de trigramas; palavras curtas usam um `find` sobre
+    todas as chaves concatenadas. A confirmação final é um `in` sobre a chave
+    normalizada e os resultados mantêm a ordem original dos itens.
+
+    Com `ident`, itens podem ser removidos ou trocados depois (deltas da
+    biblioteca) sem reconstruir o índice: removidos viram buracos e as
+    posições dos demais não mudam. Com `sort_key`, itens acrescentados fora
+    de ordem fazem os resultados serem reordenados por ela.
+    """
+
+    def __init__(
+        self, items=(), key=lambda item: item["title"], keys=None, ident=None, sort_key=None
+    ):
+        self.key = key
+        self.ident = ident
+        self.sort_key = sort_key
+        self.items = []
+        self.keys = []
+        self.positions = {}  # ident -> posição (só com `ident`)
+        self._grams = {}
+        self._blob = None
+        self._offsets = []
+        self._holes = 0
+        self._last_rank = None
+        self._unsorted = False
+        self.add(items, keys)
+
+    def __len__(self):
+        return len(self.items) - self._holes
+
+    def add(self, items, keys=None):
+        """Acrescenta itens (ex.: páginas do catálogo) sem reconstruir o índice."""
+        items = list(items)
+        keys = keys if keys is not None else [normalize(self.key(item)) for item in items]
+
+        start = len(self.items)
+        self.items.extend(items)
+        self.keys.extend(keys)
+        self._blob = None
+
+        for idx, k in enumerate(keys, start):
+            self._index_key(idx, k)
+
+        if self.ident:
+            for idx, item in enumerate(items, start):
+                self.positions[self.ident(item)] = idx
+        if self.sort_key:
+            for item in items:
+                rank = self.sort_key(item)
+                if self._last_rank is not None and rank < self._last_rank:
+                    self._unsorted = True
+                self._last_rank = rank
+
+    def remove(self, idents):
+        """Tira itens pelo `ident`; as posições dos demais não mudam."""
+        for ident in idents:
+            idx = self.positions.pop(ident, None)
+            if idx is None:
+                continue
+            self._unindex_key(idx, self.keys[idx])
+            self.items[idx] = None
+            self.keys[idx] = ""
+            self._holes += 1
+        self._blob = None
+
+    def replace(self, item):
+        """Troca o item de mesmo `ident` (ex.: capa nova); False se ele não está no índice."""
+        idx = self.positions.get(self.ident(item))
+        if idx is None:
+            return False
+        k = normalize(self.key(item))
+        if k != self.keys[idx]:
+            self._unindex_key(idx, self.keys[idx])
+            self._index_key(idx, k)
+            self.keys[idx] = k
+            self._blob = None
+        if self.sort_key and self.sort_key(item) != self.sort_key(self.items[idx]):
+            self._unsorted = True
+        self.items[idx] = item
+        return True
+
+    def _index_key(self, idx, k):
+        for gram in _trigrams(k):
+            self._grams.setdefault(gram, set()).add(idx)
+
+    def _unindex_key(self, idx, k):
+        for gram in _trigrams(k):
+            ids = self._grams.get(gram)
+            if ids is not None:
+                ids.discard(idx)
+                if not ids:
+                    del self._grams[gram]
+
+    def search(self, query: str, limit=None):
+        if not self._unsorted:
+            return self._search(query, limit)
+        # Quase ordenado (só os acrescentados fora do lugar): o timsort resolve em ~O(n)
+        results = sorted(self._search(query), key=self.sort_key)
+        return results[:limit] if limit else results
+
+    def _search(self, query, limit=None):
+        tokens = normalize(query).split()
+        if not tokens:
+            items = [item for item in self.items if item is not None] if self._holes else self.items
+            return items[:limit] if limit else list(items)
+
+        postings = []
+        for token in tokens:
+            if len(token) < 3:
+                continue
+            for gram in _trigrams(token):
+                ids = self._grams.get(gram)
+                if not ids:
+                    return []
+                postings.append(ids)
+
+        if postings:
+            postings.sort(key=len)
+            candidates = set(postings[0])
+            for ids in postings[1:]:
+                candidates &= ids
+                if not candidates:
+                    return []
+            candidates = sorted(candidates)
+        else:
+            candidates = self._scan(max(tokens, key=len))
+            if len(tokens) == 1:
+                candidates = candidates[:limit] if limit else candidates
+                return [self.items[idx] for idx in candidates]
+
+        keys = self.keys
+        results = []
+        for idx in candidates:
+            k = keys[idx]
+            if all(token in k for token in tokens):
+                results.append(self.items[idx])
+                if limit and len(results) >= limit:
+                    break
+        return results
+
+    def _scan(self, token):
+        # Busca curta (1-2 letras): varre as chaves concatenadas com str.find
+        if self._blob is None:
+            self._offsets = []
+            pos = 0
+            for k in self.keys:
+                self._offsets.append(pos)
+                pos += len(k) + 1
+            self._blob = "\n".join(self.keys)
+
+        blob, offsets = self._blob, self._offsets
+        ids = []
+        pos = blob.find(token)
+        while pos != -1:
+            idx = bisect.bisect_right(offsets, pos) - 1
+            ids.append(idx)
+            next_line = offsets[idx + 1] if idx + 1 < len(offsets) else len(blob)
+            pos = blob.find(token, next_line)
+        return ids
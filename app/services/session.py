@@ -0,0 +1,287 @@
+import ctypes
+import subprocess
+import sys
+import threading
+import time
+
+from utils.config import get_config
+from utils.constants import *
+
+# Botões do combo de saída (layout padrão do pygame para controles de PS)
+BTN_X = 2
+BTN_L1 = 4
+COMBO_DURATION = 1.0
+EXIT_HOTKEY = "esc"
+# Rede de segurança do event.wait: o fim da sessão normalmente acorda a thread
+CONTROLLER_WAKE_MS = 1000
+# Primeira janela do PCSX2 (Windows): checada a cada 50 ms até aparecer
+FIRST_FRAME_POLL = 0.05
+FIRST_FRAME_TIMEOUT = 60
+
+_current = None
+_current_lock = threading.Lock()
+
+
+def current_session():
+    return _current
+
+
+class GameSession:
+    """
+    Supervisiona uma sessão do PCSX2 sem travar a interface.
+
+    O processo é esperado numa thread (`wait`, sem polling); a saída por
+    teclado vem de um hook (`keyboard.add_hotkey`) e a do controle de
+    eventos do pygame (`event.wait`) com um Timer para o L1+X segurado.
+    `on_start`/`on_end` são chamados na thread do Tk via `root.after`.
+
+    Com um `trace` (services.launch_history.LaunchTrace) mede spawn,
+    primeiro quadro (janela visível no Windows, primeira linha de saída
+    nos demais) e inicialização do controle.
+    """
+
+    def __init__(self, exe, rom, root=None, on_start=None, on_end=None, trace=None):
+        self.exe = exe
+        self.rom = rom
+        self.root = root
+        self.on_start = on_start
+        self.on_end = on_end
+        self.minimize = get_config("session")["minimize"]
+        self.process = None
+        self.returncode = None
+        self.trace = trace
+        self._hotkey = None
+        self._combo_timer = None
+        self._ended = threading.Event()
+        self._pending = 2  # primeiro quadro + controle
+        self._pending_lock = threading.Lock()
+
+    # === Ciclo de vida ===
+    def start(self):
+        global _current
+        with _current_lock:
+            if _current is not None:
+                raise RuntimeError(GAME_ALREADY_RUNNING)
+            _current = self
+
+        # Fora do Windows o primeiro quadro é a primeira linha de saída do emulador
+        pipe = (
+            {}
+            if sys.platform == "win32"
+            else {"stdout": subprocess.PIPE, "stderr": subprocess.STDOUT}
+        )
+        spawn_start = time.perf_counter()
+        try:
+            self.process = subprocess.Popen(
+                [self.exe, "-nogui", "-batch", "-fullscreen", "--", self.rom], **pipe
+            )
+        except Exception:
+            with _current_lock:
+                _current = None
+            raise
+        if self.trace:
+            self.trace.add("spawn", (time.perf_counter() - spawn_start) * 1000)
+        print(GAME_START_INFO)
+
+        threading.Thread(target=self._wait_process, daemon=True).start()
+        threading.Thread(target=self._watch_first_frame, daemon=True).start()
+        self._install_hotkey()
+        threading.Thread(target=self._watch_controller, daemon=True).start()
+
+        self._notify(self._on_started)
+        return self
+
+    def stop(self):
+        """Encerra o emulador (hotkey, combo ou chamada externa)."""
+        if self.process and self.process.poll() is None:
+            try:
+                self.process.terminate()
+            except OSError as e:
+                print(f"[WARN] Falha ao encerrar o PCSX2: {e}")
+
+    @property
+    def running(self):
+        return not self._ended.is_set()
+
+    def _wait_process(self):
+        self.returncode = self.process.wait()
+        self._finish()
+
+    def _finish(self):
+        global _current
+        if self._ended.is_set():
+            return
+        self._ended.set()
+
+        if self._combo_timer:
+            self._combo_timer.cancel()
+        self._remove_hotkey()
+        self._wake_controller()
+
+        with _current_lock:
+            if _current is self:
+                _current = None
+        if self.trace:
+            self.trace.finish("ok" if self.trace.total is not None else "no_frame")
+        self._notify(self._on_ended)
+
+    # === Interface (thread do Tk) ===
+    def _notify(self, callback):
+        if self.root is None:
+            callback()
+            return
+        try:
+            self.root.after(0, callback)
+        except Exception as e:
+            print(f"[WARN] Falha ao notificar a interface: {e}")
+
+    def _on_started(self):
+        if self.minimize and self.root is not None:
+            self.root.iconify()
+        if callable(self.on_start):
+            self.on_start(self)
+
+    def _on_ended(self):
+        if self.minimize and self.root is not None:
+            self.root.deiconify()
+            self.root.lift()
+        if callable(self.on_end):
+            self.on_end(self)
+
+    # === Teclado: hook global só durante a sessão ===
+    def _install_hotkey(self):
+        try:
+            import keyboard
+
+            self._hotkey = keyboard.add_hotkey(EXIT_HOTKEY, self.stop)
+        except Exception as e:
+            print(f"[WARN] Atalho de saída indisponível: {e}")
+
+    def _remove_hotkey(self):
+        if self._hotkey is None:
+            return
+        try:
+            import keyboard
+
+            keyboard.remove_hotkey(self._hotkey)
+        except Exception:
+            pass
+        self._hotkey = None
+
+    # === Controle: eventos do pygame, sem polling ===
+    def _watch_controller(self):
+        try:
+            import pygame
+        except ImportError:
+            self._measured()
+            return
+
+        measured = False
+        try:
+            init_start = time.perf_counter()
+            pygame.init()
+            pygame.joystick.init()
+            count = pygame.joystick.get_count()
+            joystick = pygame.joystick.Joystick(0) if count else None
+            if self.trace:
+                self.trace.add("controller", (time.perf_counter() - init_start) * 1000)
+            measured = True
+            self._measured()
+
+            if joystick is None:
+                print(WARN_NO_CONTROLLER)
+                return
+            print(INFO_CONTROLLER_DETECTED.format(nome=joystick.get_name()))
+
+            held = set()
+            while not self._ended.is_set():
+                event = pygame.event.wait(CONTROLLER_WAKE_MS)
+                if event.type in (pygame.JOYBUTTONDOWN, pygame.JOYBUTTONUP):
+                    if event.type == pygame.JOYBUTTONDOWN:
+                        held.add(event.button)
+                    else:
+                        held.discard(event.button)
+                    self._update_combo(held)
+        except Exception as e:
+            print(f"[WARN] Falha ao monitorar o controle: {e}")
+            if not measured:
+                self._measured()
+        finally:
+            try:
+                pygame.quit()
+            except Exception:
+                pass
+
+    # === Métricas de lançamento ===
+    def _measured(self):
+        # Grava o trace quando primeiro quadro e controle já foram medidos
+        with self._pending_lock:
+            self._pending -= 1
+            done = self._pending == 0
+        if done and self.trace:
+            self.trace.finish("ok" if self.trace.total is not None else "no_frame")
+
+    def _watch_first_frame(self):
+        start = time.perf_counter()
+        try:
+            if sys.platform == "win32":
+                deadline = start + FIRST_FRAME_TIMEOUT
+                while not _has_visible_window(self.process.pid):
+                    if self._ended.wait(FIRST_FRAME_POLL) or time.perf_counter() > deadline:
+                        return
+            else:
+                if not self.process.stdout.readline():
+                    return
+            if self.trace:
+                self.trace.add("first_frame", (time.perf_counter() - start) * 1000)
+                self.trace.mark_first_frame()
+        except Exception as e:
+            print(f"[WARN] Falha ao medir o primeiro quadro: {e}")
+        finally:
+            self._measured()
+            if self.process.stdout:
+                # Continua drenando a saída para o emulador não travar no pipe
+                for _ in self.process.stdout:
+                    pass
+
+    def _update_combo(self, held):
+        pressed = {BTN_L1, BTN_X} <= held
+        if pressed and self._combo_timer is None:
+            self._combo_timer = threading.Timer(COMBO_DURATION, self._combo_fired)
+            self._combo_timer.daemon = True
+            self._combo_timer.start()
+        elif not pressed and self._combo_timer is not None:
+            self._combo_timer.cancel()
+            self._combo_timer = None
+
+    def _combo_fired(self):
+        print(INFO_COMBO_EXIT)
+        self.stop()
+
+    def _wake_controller(self):
+        # Acorda o event.wait() da thread do controle para ela encerrar
+        try:
+            import pygame
+
+            if pygame.get_init():
+                pygame.event.post(pygame.event.Event(pygame.USEREVENT))
+        except Exception:
+            pass
+
+
+def _has_visible_window(pid):
+    """True se o processo já tem uma janela visível (EnumWindows, só Windows)."""
+    user32 = ctypes.windll.user32
+    found = []
+
+    @ctypes.WINFUNCTYPE(ctypes.c_bool, ctypes.c_void_p, ctypes.c_void_p)
+    def callback(hwnd, _param):
+        owner = ctypes.c_ulong()
+        user32.GetWindowThreadProcessId(hwnd, ctypes.byref(owner))
+        if owner.value == pid and user32.IsWindowVisible(hwnd):
+            found.append(hwnd)
+            return False
+        return True
+
+    user32.EnumWindows(callback, 0)
+    return bool(found)
@@ -0,0 +1,185 @@
+import threading
+import time
+from datetime import datetime
+
+from utils.config import get_config
+
+INTERACTIVE = "interactive"  # catálogo, capas, bootstrap do emulador
+BULK = "bulk"  # ROMs
+
+
+class TransferYield(Exception):
+    """Fluxo em massa deve fechar a resposta (liberando a vaga do host) e repetir depois."""
+
+
+class TokenBucket:
+    """Balde de tokens em bytes/s; `reserve` devolve quanto esperar (aceita débito)."""
+
+    def __init__(self, rate=0, burst=None):
+        self._lock = threading.Lock()
+        self.rate = 0
+        self.burst = 0
+        self.tokens = 0.0
+        self._stamp = time.monotonic()
+        self.set_rate(rate, burst)
+
+    def set_rate(self, rate, burst=None):
+        with self._lock:
+            if rate == self.rate and (burst is None or burst == self.burst):
+                return
+            self.rate = rate or 0
+            self.burst = burst or self.rate
+            self.tokens = min(self.tokens, self.burst)
+
+    def reserve(self, amount):
+        if not self.rate:
+            return 0.0
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.burst, self.tokens + (now - self._stamp) * self.rate)
+            self._stamp = now
+            self.tokens -= amount
+            return -self.tokens / self.rate if self.tokens < 0 else 0.0
+
+
+def _minutes(text):
+    hours, minutes = text.split(":")
+    return int(hours) * 60 + int(minutes)
+
+
+def scheduled_rate(rules, now=None):
+    """
+    Limite de bytes/s para downloads em massa no horário atual (0 = sem limite).
+
+    Regras do config: [{"from": "09:00", "to": "18:00", "rate": 1048576}];
+    janelas que passam da meia-noite ("22:00" -> "06:00") também valem.
+    """
+    now = now or datetime.now()
+    current = now.hour * 60 + now.minute
+    for rule in rules:
+        try:
+            start, end = _minutes(rule["from"]), _minutes(rule["to"])
+        except (KeyError, ValueError, AttributeError):
+            continue
+        inside = start <= current < end if start <= end else current >= start or current < end
+        if inside:
+            return int(rule.get("rate", 0))
+    return 0
+
+
+class Transfer:
+    """
+    Uma transferência; chamar `throttle(n)` a cada bloco recebido.
+
+    Interativas só contam como ativas no primeiro bloco, quando já têm a
+    vaga do host e a resposta: enfileiradas não freiam os downloads em massa.
+    """
+
+    def __init__(self, scheduler, priority, rate=0):
+        self.scheduler = scheduler
+        self.priority = priority
+        self.bucket = TokenBucket(rate) if rate else None
+        self.counted = priority == BULK
+
+    def throttle(self, amount):
+        if not self.counted:
+            self.scheduler._activate(self)
+        self.scheduler._throttle(self, amount)
+
+    def wait_turn(self, cancelled=None):
+        """Depois de um TransferYield: espera as interativas antes de reabrir."""
+        self.scheduler._wait_turn(cancelled)
+
+    def close(self):
+        self.scheduler._close(self)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class TransferScheduler:
+    """
+    Reparte a banda entre transferências por classe de prioridade.
+
+    Transferências interativas passam na frente: enquanto houver alguma
+    ativa, os downloads em massa caem para `bulk_yield_rate`. Com 0 eles
+    levantam TransferYield, fecham a resposta e esperam em `wait_turn`,
+    sem segurar a vaga do host parados.
+    Há um balde global, um por transferência (`rate` ao abrir) e o limite
+    por horário do config ("transfers.schedule") para a classe em massa.
+    """
+
+    def __init__(self, config=None):
+        config = config or get_config("transfers")
+        self.schedule = config["schedule"]
+        self._global = TokenBucket(config["global_rate"])
+        self._bulk = TokenBucket()
+        self._yield = TokenBucket(config["bulk_yield_rate"])
+        self._yield_rate = config["bulk_yield_rate"]
+        self._active = {INTERACTIVE: 0, BULK: 0}
+        self._idle = threading.Condition()
+        self._schedule_checked = float("-inf")
+
+    def open(self, priority=BULK, rate=0):
+        transfer = Transfer(self, priority, rate)
+        if transfer.counted:
+            with self._idle:
+                self._active[priority] += 1
+        return transfer
+
+    def _activate(self, transfer):
+        with self._idle:
+            if not transfer.counted:
+                transfer.counted = True
+                self._active[transfer.priority] += 1
+
+    def active(self):
+        with self._idle:
+            return dict(self._active)
+
+    def _close(self, transfer):
+        with self._idle:
+            if transfer.counted:
+                transfer.counted = False
+                self._active[transfer.priority] -= 1
+            self._idle.notify_all()
+
+    def _wait_turn(self, cancelled=None):
+        if self._yield_rate:
+            return
+        with self._idle:
+            while self._active[INTERACTIVE] and not (cancelled and cancelled()):
+                self._idle.wait(0.5)
+
+    def _throttle(self, transfer, amount):
+        delays = [self._global.reserve(amount)]
+        if transfer.bucket:
+            delays.append(transfer.bucket.reserve(amount))
+
+        if transfer.priority == BULK:
+            self._refresh_schedule()
+            delays.append(self._bulk.reserve(amount))
+            with self._idle:
+                busy = self._active[INTERACTIVE] > 0
+            if busy and not self._yield_rate:
+                # Cede a banda toda sem ficar parado com a vaga do host
+                raise TransferYield()
+            if busy:
+                delays.append(self._yield.reserve(amount))
+
+        delay = max(delays)
+        if delay > 0:
+            time.sleep(delay)
+
+    def _refresh_schedule(self):
+        # Reavalia as regras de horário no máximo uma vez por minuto
+        now = time.monotonic()
+        if now - self._schedule_checked >= 60:
+            self._schedule_checked = now
+            self._bulk.set_rate(scheduled_rate(self.schedule))
+
+
+transfer_scheduler = TransferScheduler()
@@ -0,0 +1,73 @@
+import threading
+
+from services.cover_loader import cover_loader
+from services.library import library_index, list_games, update_library
+from utils.icons import preload_assets
+from utils.thumbnails import get_card_image
+
+# Primeira tela do grid: 6 colunas x 3 linhas visíveis + 1 linha de overscan
+FIRST_SCREEN = 24
+CARD_SIZE = (130, 180)
+
+
+class WarmState:
+    """Estado pronto para a home: jogos, índice de busca e quantas capas já vieram."""
+
+    def __init__(self, games, index, covers):
+        self.games = games
+        self.index = index
+        self.covers = covers
+
+
+class Warmup:
+    """
+    Aquecimento em segundo plano enquanto o splash está na tela.
+
+    Varre a biblioteca, decodifica os ícones e compõe os thumbnails da
+    primeira tela do grid, deixando-os no CoverLoader para os cards
+    pintarem sem esperar. `wait()` devolve o WarmState (ou None se falhou).
+    """
+
+    def __init__(self, first_screen=FIRST_SCREEN, card_size=CARD_SIZE):
+        self.first_screen = first_screen
+        self.card_size = card_size
+        self.state = None
+        self._done = threading.Event()
+
+    def start(self):
+        threading.Thread(target=self._run, daemon=True).start()
+        return self
+
+    def wait(self, timeout=None):
+        self._done.wait(timeout)
+        return self.state
+
+    def _run(self):
+        try:
+            icons = preload_assets()
+
+            update_library()
+            games = list_games()
+            index = library_index(games)
+
+            images = ["default.png"] + [g["image"] for g in games[: self.first_screen]]
+            covers = 0
+            for image in dict.fromkeys(images):
+                try:
+                    composed = get_card_image(image, self.card_size)
+                except Exception as e:
+                    print(f"[WARN] Falha ao pré-compor capa '{image}': {e}")
+                    continue
+                cover_loader.prime(image, self.card_size, composed)
+                covers += 1
+
+            icons.join()
+            self.state = WarmState(games, index, covers)
+        except Exception as e:
+            print(f"[WARN] Falha no aquecimento da biblioteca: {e}")
+        finally:
+            self._done.set()
+
+
+def start_warmup(**kwargs):
+    return Warmup(**kwargs).start()
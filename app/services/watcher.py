@@ -0,0 +1,153 @@
+import ctypes
+import ctypes.util
+import os
+import select
+import sys
+import threading
+import time
+
+from services.library import update_library
+from utils.paths import get_cover_path, get_rom_path
+
+# === Máscara inotify (linux/inotify.h) ===
+IN_ATTRIB = 0x004
+IN_CLOSE_WRITE = 0x008
+IN_MOVED_FROM = 0x040
+IN_MOVED_TO = 0x080
+IN_CREATE = 0x100
+IN_DELETE = 0x200
+IN_DELETE_SELF = 0x400
+IN_MOVE_SELF = 0x800
+WATCH_MASK = (
+    IN_ATTRIB
+    | IN_CLOSE_WRITE
+    | IN_MOVED_FROM
+    | IN_MOVED_TO
+    | IN_CREATE
+    | IN_DELETE
+    | IN_DELETE_SELF
+    | IN_MOVE_SELF
+)
+
+
+def _open_inotify(paths):
+    """Retorna um fd inotify observando os diretórios, ou None se indisponível."""
+    if not sys.platform.startswith("linux"):
+        return None
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if fd < 0:
+            return None
+        for path in paths:
+            if libc.inotify_add_watch(fd, os.fsencode(path), WATCH_MASK) < 0:
+                os.close(fd)
+                return None
+        return fd
+    except (OSError, AttributeError):
+        return None
+
+
+class LibraryWatcher:
+    """
+    Observa /roms e /covers e entrega deltas {"added", "removed", "changed"}.
+
+    Usa inotify no Linux e polling de mtime dos diretórios nos demais sistemas.
+    Rajadas de eventos são agrupadas: o delta só é calculado depois de `quiet`
+    segundos sem novos eventos (ou `max_delay` desde o primeiro), então copiar
+    200 ROMs gera uma única atualização. `on_change` roda na thread do watcher.
+    """
+
+    def __init__(self, on_change, quiet=0.5, max_delay=3.0, poll_interval=2.0):
+        self.on_change = on_change
+        self.quiet = quiet
+        self.max_delay = max_delay
+        self.poll_interval = poll_interval
+        self.paths = [get_rom_path(""), get_cover_path("")]
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    # === Loop principal ===
+    def _run(self):
+        fd = _open_inotify(self.paths)
+        try:
+            if fd is not None:
+                self._run_inotify(fd)
+            else:
+                self._run_polling()
+        finally:
+            if fd is not None:
+                os.close(fd)
+
+    def _run_inotify(self, fd):
+        first_event = None
+        last_event = None
+
+        while not self._stop.is_set():
+            timeout = self.quiet if first_event else 1.0
+            ready, _, _ = select.select([fd], [], [], timeout)
+            now = time.monotonic()
+
+            if ready:
+                try:
+                    while os.read(fd, 64 * 1024):
+                        pass
+                except BlockingIOError:
+                    pass
+                first_event = first_event or now
+                last_event = now
+
+            if first_event and (
+                now - last_event >= self.quiet or now - first_event >= self.max_delay
+            ):
+                first_event = last_event = None
+                # Eventos de escrita não alteram o mtime do diretório
+                self._emit(force=True)
+
+    def _run_polling(self):
+        last_seen = self._snapshot()
+        first_change = None
+        last_change = None
+
+        while not self._stop.wait(self.quiet if first_change else self.poll_interval):
+            now = time.monotonic()
+            current = self._snapshot()
+
+            if current != last_seen:
+                last_seen = current
+                first_change = first_change or now
+                last_change = now
+
+            if first_change and (
+                now - last_change >= self.quiet or now - first_change >= self.max_delay
+            ):
+                first_change = last_change = None
+                self._emit(force=False)
+
+    def _snapshot(self):
+        mtimes = []
+        for path in self.paths:
+            try:
+                mtimes.append(os.stat(path).st_mtime_ns)
+            except OSError:
+                mtimes.append(None)
+        return mtimes
+
+    def _emit(self, force):
+        try:
+            delta = update_library(force=force)
+        except Exception as e:
+            print(f"[WARN] Falha ao atualizar biblioteca: {e}")
+            return
+        if any(delta.values()) and callable(self.on_change):
+            self.on_change(delta)
@@ -2,18 +2,22 @@ import os
 
 import customtkinter as ctk
 from customtkinter import CTkImage
-from PIL import Image, ImageOps
+from services.cover_loader import cover_loader
+from utils.config import get_config
 from utils.icons import load_icons
-from utils.paths import get_asset_path, get_cover_path
+from utils.paths import get_cover_path
+from utils.thumbnails import get_card_image
 from utils.theme import *
 
 
 class GameCard(ctk.CTkFrame):
+    _placeholders = {}  # placeholder (default.png) compartilhado por tamanho
+
     def __init__(
         self,
         parent,
-        title: str,
-        image: str,
+        title: str = "",
+        image: str = "default.png",
         platform: str = "ps1",
         on_click=None,
         on_edit=None,
@@ -32,53 +36,24 @@ class GameCard(ctk.CTkFrame):
         )
 
         self.pack_propagate(False)
-        self.title = title
-        self.image = image
         self.platform = platform
-        self.on_click = on_click
-        self.on_edit = on_edit
-        self.on_delete = on_delete
+        self.card_width = width
+        self.card_height = height
+        self.title = None
+        self.image = None
+        self.cover_stamp = None
+        self.tk_image = None
+        self.cover_request = None
+        self.on_hover = None
+        self.hover_job = None
+        self.hover_delay = get_config("prewarm").get("hover_delay_ms", 150)
         self.root = self.winfo_toplevel()
-
-        # === Caminhos ===
-        cover_path = get_cover_path(self.image)
-        if not os.path.exists(cover_path):
-            cover_path = get_cover_path("default.png")
-
-        frame_path = get_asset_path("ps1_path.png")
-        if not os.path.exists(frame_path):
-            raise FileNotFoundError(f"Frame not found: {frame_path}")
-
-        # === Carrega imagens ===
-        cover = Image.open(cover_path).convert("RGBA")
-        frame = Image.open(frame_path).convert("RGBA")
-
-        margin = 2
-        inner_width = width - (margin * 2)
-        inner_height = height - (margin * 2)
-
-        # Ajusta proporcionalmente mantendo o aspecto
-        cover_fit = ImageOps.contain(cover, (inner_width, inner_height), Image.LANCZOS)
-
-        # Centraliza a capa no espaço total
-        composed = Image.new("RGBA", (width, height), (0, 0, 0, 0))
-        x = (width - cover_fit.width) // 2
-        y = (height - cover_fit.height) // 2
-        composed.paste(cover_fit, (x, y))
-        frame = frame.resize((width, height), Image.LANCZOS)
-        composed.paste(frame, (0, 0), mask=frame)
-
-        # === Cria imagem final ===
-        self.tk_image = CTkImage(light_image=composed, dark_image=composed, size=(width, height))
-
-        # === Texto do card ===
-        title_text = title if len(title) <= 18 else title[:15] + "..."
+        cover_loader.attach(self)
 
         # === Botão principal ===
         self.button = ctk.CTkButton(
             self,
-            image=self.tk_image,
-            text=title_text,
+            text="",
             compound="top",
             fg_color=TRANSPARENT,
             hover_color="#1D1D1D",
@@ -86,12 +61,117 @@ class GameCard(ctk.CTkFrame):
             height=height,
             text_color="white",
             font=TITLE_GAME,
-            command=self.on_click,
+            command=self._on_button_click,
         )
         self.button.pack(expand=True, fill="both")
 
         # === Bind botão direito ===
         self.button.bind("<Button-3>", self.open_context_menu)
+        # === Hover/foco: pré-aquece a ROM antes do clique ===
+        # bind do CTkButton vai para o canvas interno, que sem takefocus nunca
+        # recebe foco: com ele o Tab passa pelos cards e o <FocusIn> dispara
+        self.button._canvas.configure(takefocus=1)
+        self.button.bind("<Enter>", self._schedule_hover, add="+")
+        self.button.bind("<FocusIn>", self._schedule_hover, add="+")
+        self.button.bind("<Leave>", self._cancel_hover, add="+")
+        self.button.bind("<FocusOut>", self._cancel_hover, add="+")
+        self.button.bind("<Return>", lambda e: self._on_button_click(), add="+")
+
+        self.set_game(title, image, on_click, on_edit, on_delete)
+
+    def destroy(self):
+        # bind("<Destroy>") do CustomTkinter iria para o canvas interno
+        self._cancel_cover()
+        self._cancel_hover()
+        super().destroy()
+
+    # === Reaproveita o card para outro jogo (grid virtualizado) ===
+    def set_game(
+        self, title, image, on_click=None, on_edit=None, on_delete=None, priority=0, on_hover=None
+    ):
+        self.on_click = on_click
+        self.on_hover = on_hover
+        self.on_edit = on_edit
+        self.on_delete = on_delete
+
+        # Capa trocada no disco mantém o nome; o mtime detecta a mudança
+        stamp = self._cover_stamp(image)
+        if title == self.title and image == self.image and stamp == self.cover_stamp:
+            return
+
+        if image != self.image or stamp != self.cover_stamp:
+            self.image = image
+            self.cover_stamp = stamp
+            self._load_cover(image, priority)
+
+        self.title = title
+        title_text = title if len(title) <= 18 else title[:15] + "..."
+        self.button.configure(image=self.tk_image, text=title_text)
+
+    def _on_button_click(self):
+        if callable(self.on_click):
+            self.on_click()
+
+    def _schedule_hover(self, _event=None):
+        self._cancel_hover()
+        if callable(self.on_hover):
+            self.hover_job = self.after(self.hover_delay, self._on_hover)
+
+    def _cancel_hover(self, _event=None):
+        if self.hover_job:
+            self.after_cancel(self.hover_job)
+            self.hover_job = None
+
+    def _on_hover(self):
+        self.hover_job = None
+        if callable(self.on_hover):
+            self.on_hover()
+
+    def _cover_stamp(self, image):
+        try:
+            return os.stat(get_cover_path(image)).st_mtime_ns
+        except OSError:
+            return None
+
+    # === Capa: placeholder imediato, imagem real via CoverLoader ===
+    def _placeholder(self):
+        size = (self.card_width, self.card_height)
+        if size not in GameCard._placeholders:
+            composed = cover_loader.take_primed("default.png", size) or get_card_image(
+                "default.png", size
+            )
+            GameCard._placeholders[size] = CTkImage(
+                light_image=composed, dark_image=composed, size=size
+            )
+        return GameCard._placeholders[size]
+
+    def _load_cover(self, image, priority):
+        self._cancel_cover()
+        self.tk_image = self._placeholder()
+        if image == "default.png":
+            return
+        self.cover_request = cover_loader.request(
+            image, (self.card_width, self.card_height), self._on_cover_ready, priority
+        )
+
+    def _on_cover_ready(self, composed):
+        self.cover_request = None
+        size = (self.card_width, self.card_height)
+        self.tk_image = CTkImage(light_image=composed, dark_image=composed, size=size)
+        self.button.configure(image=self.tk_image)
+
+    # === Saiu da área visível (grid virtualizado) ===
+    def release(self):
+        """Cancela a capa ainda na fila e o hover pendente; o próximo set_game recarrega."""
+        self._cancel_hover()
+        if self.cover_request:
+            self._cancel_cover()
+            self.image = None
+
+    def _cancel_cover(self):
+        if self.cover_request:
+            self.cover_request.cancel()
+            self.cover_request = None
 
     # === Menu de contexto (botão direito) ===
     def open_context_menu(self, event):
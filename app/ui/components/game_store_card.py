@@ -1,24 +1,18 @@
-import os
-
 import customtkinter as ctk
-from services.download import download_game
-from utils.paths import get_rom_path
+from services.download import active_downloads, download_game, download_manager
+from services.installed import installed_games
+from services.integrity import normalize_expected
 
 
 class GameStoreCard(ctk.CTkFrame):
 
-    def __init__(self, parent, game, icons, update_log, refresh_callback):
+    def __init__(self, parent, game=None, icons=None, update_log=None, refresh_callback=None):
         super().__init__(parent, fg_color="#1e1e1e", corner_radius=10, height=70)
-        self.pack(fill="x", pady=6, padx=10)
-        self.pack_propagate(False)
+        self.grid_propagate(False)
         self.grid_columnconfigure(0, weight=1)
         self.grid_columnconfigure(1, weight=0)
 
-        # === Game Info ===
-        self.name = game.get("name", "Unnamed Game")
-        self.link = game.get("game", "")
-        self.cover = game.get("cover", "")
-        self.size = game.get("size", "")
+        self.name = None
         self.icons = icons
         self.update_log = update_log
         self.refresh_callback = refresh_callback
@@ -27,43 +21,68 @@ class GameStoreCard(ctk.CTkFrame):
         info_frame = ctk.CTkFrame(self, fg_color="transparent")
         info_frame.grid(row=0, column=0, sticky="w", padx=15, pady=(8, 8))
 
-        ctk.CTkLabel(
+        self.name_label = ctk.CTkLabel(
             info_frame,
-            text=self.name,
+            text="",
             font=("Segoe UI", 14, "bold"),
             text_color="white",
-        ).pack(anchor="w")
+        )
+        self.name_label.pack(anchor="w")
 
-        if self.size:
-            ctk.CTkLabel(
-                info_frame,
-                text=self.size,
-                font=("Segoe UI", 12),
-                text_color="#aaa",
-            ).pack(anchor="w", pady=(0, 2))
+        self.size_label = ctk.CTkLabel(
+            info_frame,
+            text="",
+            font=("Segoe UI", 12),
+            text_color="#aaa",
+        )
 
         # === Download Button ===
-        roms_available = {
-            os.path.splitext(f)[0]
-            for f in os.listdir(get_rom_path(""))
-            if f.lower().endswith(".chd")
-        }
-
-        downloaded = self.name in roms_available
         self.btn = ctk.CTkButton(
             self,
             text="",
-            image=self.icons["check"] if downloaded else self.icons["download"],
+            image=self.icons["download"],
             width=40,
             height=30,
             fg_color="transparent",
+            command=self._on_button,
         )
         self.btn.grid(row=0, column=1, padx=(0, 20))
 
-        if not downloaded:
-            self.btn.configure(command=self._download)
+        if game:
+            self.set_game(game)
+
+    # === Reaproveita a linha para outro jogo (lista virtualizada) ===
+    def set_game(self, game):
+        self.name = game.get("name", "Unnamed Game")
+        self.link = game.get("game", "")
+        self.cover = game.get("cover", "")
+        self.size = game.get("size", "")
+        self.expected = normalize_expected(game)
+
+        self.name_label.configure(text=self.name)
+        if self.size:
+            self.size_label.configure(text=self.size)
+            self.size_label.pack(anchor="w", pady=(0, 2))
         else:
+            self.size_label.pack_forget()
+
+        self.refresh_state()
+
+    def refresh_state(self):
+        # Instalado: check; baixando: botão cancela; senão: download
+        if self.name in installed_games:
+            self.btn.configure(image=self.icons["check"], state="disabled")
+        elif self.name in active_downloads:
+            self.btn.configure(image=self.icons["clear"], state="normal")
+        else:
+            self.btn.configure(image=self.icons["download"], state="normal")
+
+    def _on_button(self):
+        if self.name in active_downloads:
+            download_manager.cancel(self.name)
             self.btn.configure(state="disabled")
+        else:
+            self._download()
 
     # === Download Function ===
     def _download(self):
@@ -72,13 +91,9 @@ class GameStoreCard(ctk.CTkFrame):
             "game": self.link,
             "cover": self.cover,
             "size": self.size or "0 MB",
+            "bytes": self.expected.get("bytes", 0),
+            "sha1": self.expected.get("sha1", ""),
+            "crc32": self.expected.get("crc32", ""),
         }
 
-        download_game(
-            game,
-            self.btn,
-            self.update_log,
-            self.refresh_callback,
-            self,
-            self.icons["check"],
-        )
+        download_game(game, self.update_log, self.refresh_callback, self)
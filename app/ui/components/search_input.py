@@ -14,6 +14,7 @@ class SearchInput(ctk.CTkFrame):
         width=400,
         height=40,
         auto_focus=False,
+        debounce_ms=150,
     ):
         super().__init__(
             parent, fg_color=SURFACE_LIGHT, corner_radius=RADIUS, width=width, height=height
@@ -25,6 +26,9 @@ class SearchInput(ctk.CTkFrame):
         self.on_refresh = on_refresh
         self.search_var = StringVar(value=placeholder)
         self._bind_id = None
+        self.debounce_ms = debounce_ms
+        self._pending_search = None
+        self._last_query = None
 
         from utils.icons import load_icons
 
@@ -102,10 +106,21 @@ class SearchInput(ctk.CTkFrame):
             self.entry.configure(text_color=TEXT_MUTED, fg_color=SURFACE_LIGHT)
 
     def _on_text_change(self, *_):
-        if callable(self.on_change):
-            txt = self.search_var.get()
-            if txt != self.placeholder:
-                self.on_change(txt)
+        if not callable(self.on_change) or self.search_var.get() == self.placeholder:
+            return
+
+        # Debounce: cada tecla cancela a busca anterior que ainda não rodou
+        if self._pending_search:
+            self.after_cancel(self._pending_search)
+        self._pending_search = self.after(self.debounce_ms, self._dispatch_search)
+
+    def _dispatch_search(self):
+        self._pending_search = None
+        query = self.get_value()
+        if query == self._last_query:
+            return
+        self._last_query = query
+        self.on_change(query)
 
     # --- Clique fora ---
     def _bind_click_outside(self):
@@ -125,6 +140,12 @@ class SearchInput(ctk.CTkFrame):
         self._bind_id = root.bind_all("<ButtonRelease-1>", handle_click, add="+")
 
     def _on_destroy(self, _=None):
+        if self._pending_search:
+            try:
+                self.after_cancel(self._pending_search)
+            except Exception:
+                pass
+            self._pending_search = None
         try:
             root = self.winfo_toplevel()
             if self._bind_id:
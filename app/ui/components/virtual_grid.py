@@ -0,0 +1,240 @@
+import math
+
+import customtkinter as ctk
+from ui.components.widget_pool import WidgetPool
+from utils.constants import *
+from utils.theme import *
+
+WHEEL_EVENTS = ("<MouseWheel>", "<Button-4>", "<Button-5>")
+
+
+class VirtualGrid(ctk.CTkFrame):
+    """
+    Grid virtualizado: só existem widgets para as linhas visíveis (+ overscan).
+
+    `create_item(parent)` cria um widget vazio e `bind_item(widget, item, index)`
+    o associa a um item da lista. Ao rolar, widgets que saem da área visível
+    voltam para um pool (avisados por `release_item(widget)`, se dado) e são
+    reaproveitados pelas linhas que entram.
+
+    O controle de quais widgets estão ligados fica no WidgetPool.
+    Com `key`, `set_items` reconcilia a lista nova com a atual: widgets de
+    itens que continuam na lista são mantidos, só itens alterados são
+    religados e só widgets que mudaram de posição são movidos.
+
+    A roda do mouse é ligada (bind_all) só enquanto o cursor está sobre o
+    grid e desligada ao sair ou ao destruí-lo. `bind` do CustomTkinter vai
+    para o canvas interno (coberto pelos filhos), então <Enter>/<Leave>
+    usam uma bindtag própria aplicada ao viewport, à barra e aos cards.
+    """
+
+    _wheel_owner = None  # grid que está com a roda do mouse no momento
+
+    def __init__(
+        self,
+        parent,
+        create_item,
+        bind_item,
+        cell_width,
+        cell_height,
+        columns=None,
+        overscan=1,
+        padx=10,
+        pady=10,
+        stretch=False,
+        empty_text=NO_GAMES_FOUND,
+        fg_color=BACKGROUND_DARK,
+        wheel_step=60,
+        key=None,
+        release_item=None,
+    ):
+        super().__init__(parent, fg_color=fg_color, corner_radius=0)
+
+        self.pool = WidgetPool(create_item, bind_item, release_item, key)
+        self.cell_width = cell_width
+        self.cell_height = cell_height
+        self.columns = columns
+        self.overscan = overscan
+        self.padx = padx
+        self.pady = pady
+        self.stretch = stretch
+        self.wheel_step = wheel_step
+
+        self.items = []
+        self.offset = 0
+        self._layout_pending = False
+
+        self.viewport = ctk.CTkFrame(self, fg_color=fg_color, corner_radius=0)
+        self.viewport.pack(side="left", fill="both", expand=True)
+
+        self.scrollbar = ctk.CTkScrollbar(self, command=self._on_scrollbar)
+        self.scrollbar.pack(side="right", fill="y")
+
+        self.empty_label = ctk.CTkLabel(
+            self.viewport,
+            text=empty_text,
+            text_color=TEXT_SECONDARY,
+            font=(FONT_FAMILY, FONT_SIZE_LG, FONT_WEIGHT_BOLD),
+        )
+
+        self.viewport.bind("<Configure>", lambda e: self.schedule_layout(), add="+")
+        self._wheel_tag = f"VirtualGridWheel{id(self)}"
+        self.bind_class(self._wheel_tag, "<Enter>", self._grab_wheel)
+        self.bind_class(self._wheel_tag, "<Leave>", self._release_wheel)
+        self._tag_tree(self.viewport)
+        self._tag_tree(self.scrollbar)
+
+    def destroy(self):
+        self._release_wheel()
+        for sequence in ("<Enter>", "<Leave>"):
+            self.unbind_class(self._wheel_tag, sequence)
+        super().destroy()
+
+    # === API pública ===
+    def set_items(self, items, keep_scroll=False):
+        self.items = list(items)
+        if not keep_scroll:
+            self.offset = 0
+
+        if self.pool.key is None:
+            self.pool.release_all()
+        else:
+            self.pool.reconcile(self.items)
+        self.layout()
+
+    def reset(self):
+        """Esquece os itens ligados (ex.: a lista foi recarregada e os itens mudaram de sentido)."""
+        self.pool.forget()
+        self.set_items([])
+
+    def scroll_to(self, offset):
+        self.offset = offset
+        self.layout()
+
+    def schedule_layout(self):
+        # Agrupa vários <Configure>/scroll num único layout por ciclo do Tk
+        if not self._layout_pending:
+            self._layout_pending = True
+            self.after_idle(self.layout)
+
+    # === Layout ===
+    def _viewport_size(self):
+        # place() do CustomTkinter aplica o scaling de DPI; trabalhamos em unidades não escaladas
+        scaling = self._get_widget_scaling()
+        return (
+            self.viewport.winfo_width() / scaling,
+            self.viewport.winfo_height() / scaling,
+        )
+
+    def _column_count(self, width):
+        if self.columns:
+            return self.columns
+        return max(1, int(width // self.cell_width))
+
+    def layout(self):
+        self._layout_pending = False
+        if not self.winfo_exists():
+            return
+
+        width, height = self._viewport_size()
+        if width <= 1 or height <= 1:
+            return
+
+        if not self.items:
+            self.pool.release_all()
+            self.empty_label.place(relx=0.5, y=50, anchor="n")
+            self.scrollbar.set(0, 1)
+            return
+        self.empty_label.place_forget()
+
+        columns = self._column_count(width)
+        rows = math.ceil(len(self.items) / columns)
+        content_height = rows * self.cell_height + self.pady
+        self.offset = max(0, min(self.offset, content_height - height))
+
+        first_row = max(0, int(self.offset // self.cell_height) - self.overscan)
+        last_row = min(rows, int((self.offset + height) // self.cell_height) + 1 + self.overscan)
+        wanted = range(first_row * columns, min(len(self.items), last_row * columns))
+
+        # Devolve ao pool os widgets que saíram da janela visível
+        self.pool.release_outside(wanted)
+
+        for index in wanted:
+            widget, rebound = self.pool.acquire(index, self.items[index], self.viewport)
+            if rebound:
+                # Religar pode criar filhos (ex.: label da imagem do botão)
+                self._tag_tree(widget)
+
+            row, col = divmod(index, columns)
+            y = row * self.cell_height + self.pady - self.offset
+            if self.stretch:
+                item_width = int(width - 2 * self.padx)
+                if widget.cget("width") != item_width:
+                    widget.configure(width=item_width)
+                position = (self.padx, y)
+            else:
+                position = (col * self.cell_width + self.padx, y)
+
+            # Widget que não mudou de lugar não é tocado
+            if self.pool.move(widget, position):
+                widget.place(x=position[0], y=position[1])
+
+        self.scrollbar.set(self.offset / content_height, (self.offset + height) / content_height)
+
+    # === Rolagem ===
+    def _on_scrollbar(self, action, *args):
+        width, height = self._viewport_size()
+        if action == "moveto":
+            columns = self._column_count(width)
+            rows = math.ceil(len(self.items) / columns)
+            self.offset = int(float(args[0]) * (rows * self.cell_height + self.pady))
+        elif action == "scroll":
+            step = height if args[1] == "pages" else self.wheel_step
+            self.offset += int(args[0]) * step
+        self.layout()
+
+    def _tag_tree(self, widget):
+        # Acrescenta a bindtag da roda ao widget e a todos os filhos Tk dele
+        tags = widget.bindtags()
+        if self._wheel_tag not in tags:
+            widget.bindtags(tags + (self._wheel_tag,))
+        for child in widget.winfo_children():
+            self._tag_tree(child)
+
+    def _grab_wheel(self, _event=None):
+        for sequence in WHEEL_EVENTS:
+            self.bind_all(sequence, self._on_mouse_wheel)
+        VirtualGrid._wheel_owner = self
+
+    def _release_wheel(self, event=None):
+        if VirtualGrid._wheel_owner is not self:
+            return
+        # <Leave> também chega ao passar do grid para um card dentro dele
+        if event is not None and self._under_pointer(event.x_root, event.y_root):
+            return
+        for sequence in WHEEL_EVENTS:
+            self.unbind_all(sequence)
+        VirtualGrid._wheel_owner = None
+
+    def _under_pointer(self, x_root, y_root):
+        try:
+            widget = self.winfo_containing(x_root, y_root)
+        except Exception:
+            return False
+        path = str(self)
+        return widget is not None and (str(widget) == path or str(widget).startswith(path + "."))
+
+    def _on_mouse_wheel(self, event):
+        # Defesa extra: só rola se o evento veio de dentro deste grid
+        path = str(self)
+        widget = str(event.widget)
+        if not self.winfo_exists() or not (widget == path or widget.startswith(path + ".")):
+            return
+        if event.num == 4:
+            direction = -1
+        elif event.num == 5:
+            direction = 1
+        else:
+            direction = -1 if event.delta > 0 else 1
+        self.offset += direction * self.wheel_step
+        self.layout()
@@ -0,0 +1,85 @@
+class WidgetPool:
+    """
+    Controle do grid virtualizado, sem depender de Tk.
+
+    Guarda qual widget está ligado a qual índice, o pool de widgets livres,
+    o item ligado a cada widget e a última posição aplicada. Widgets só
+    precisam de `place_forget()`; criar, ligar e liberar ficam com os
+    callbacks do grid.
+    """
+
+    def __init__(self, create_item, bind_item, release_item=None, key=None):
+        self.create_item = create_item
+        self.bind_item = bind_item
+        self.release_item = release_item
+        self.key = key
+        self.bound = {}  # índice -> widget
+        self.free = []
+        self.widget_item = {}  # widget -> item atualmente ligado
+        self.placed = {}  # widget -> (x, y)
+
+    def release(self, widget):
+        widget.place_forget()
+        self.placed.pop(widget, None)
+        if self.release_item:
+            # Widget liberado pode ter cancelado trabalho: religa ao voltar
+            self.release_item(widget)
+            self.widget_item.pop(widget, None)
+        self.free.append(widget)
+
+    def release_all(self):
+        for widget in self.bound.values():
+            self.release(widget)
+        self.bound = {}
+
+    def release_outside(self, wanted):
+        """Devolve ao pool os widgets cujos índices saíram de `wanted`."""
+        for index in [i for i in self.bound if i not in wanted]:
+            self.release(self.bound.pop(index))
+
+    def forget(self):
+        """Esquece os itens ligados: o próximo acquire religa tudo."""
+        self.widget_item = {}
+
+    def reconcile(self, items):
+        """Mantém os widgets de itens que continuam em `items` (por `key`), religando os alterados."""
+        new_index = {self.key(item): i for i, item in enumerate(items)}
+        bound = {}
+
+        for widget in self.bound.values():
+            old_item = self.widget_item.get(widget)
+            index = new_index.get(self.key(old_item)) if old_item is not None else None
+
+            # Chave sumiu ou repetida (outro widget já ficou com o índice): libera
+            if index is None or index in bound:
+                self.release(widget)
+                continue
+
+            item = items[index]
+            if item != old_item:
+                self.bind_item(widget, item, index)
+                self.widget_item[widget] = item
+            bound[index] = widget
+
+        self.bound = bound
+
+    def acquire(self, index, item, parent):
+        """Widget para o índice (ligado, do pool ou novo); retorna (widget, religado)."""
+        widget = self.bound.get(index)
+        if widget is not None:
+            return widget, False
+
+        widget = self.free.pop() if self.free else self.create_item(parent)
+        rebound = self.widget_item.get(widget) != item
+        if rebound:
+            self.bind_item(widget, item, index)
+            self.widget_item[widget] = item
+        self.bound[index] = widget
+        return widget, rebound
+
+    def move(self, widget, position):
+        """Registra a posição; True se o widget precisa ser movido."""
+        if self.placed.get(widget) == position:
+            return False
+        self.placed[widget] = position
+        return True
@@ -4,9 +4,8 @@ import threading
 
 import customtkinter as ctk
 import pygame
-from PIL import Image
 from utils.constants import *
-from utils.icons import load_button_image, load_icons
+from utils.icons import load_asset_image, load_button_image, load_icons
 from utils.paths import get_asset_path, get_emulator_path
 from utils.theme import *
 
@@ -237,7 +236,7 @@ class ControlSettings:
         }
 
         self.img_path = get_asset_path("joystick.png")
-        img = ctk.CTkImage(Image.open(self.img_path), size=(360, 250))
+        img = load_asset_image("joystick.png", (360, 250))
         self.img_label = ctk.CTkLabel(self.center, text="", image=img)
         self.img_label.pack(pady=20)
 
@@ -1,63 +1,129 @@
 import customtkinter as ctk
+from services.library import get_games, library_index, update_library
+from services.watcher import LibraryWatcher
 from ui.components.footer import create_footer
 from ui.components.game_card import GameCard
 from ui.components.search_input import SearchInput
-from ui.control_settings import ControlSettings
+from ui.components.virtual_grid import VirtualGrid
+from utils import startup
 from utils.constants import *
-from utils.game import change_cover, delete_game, search_game, start_game
+from utils.game import change_cover, delete_game, prewarm_game, search_game, start_game
 from utils.icons import load_icons
 from utils.theme import *
 
 root = None
 game_frame = None
-images = []
+grid = None
+current_term = ""
+search_index = library_index([])
+watcher = None
+session = None  # GameSession em andamento (só um jogo por vez)
+session_label = None
+
+CARD_CELL_WIDTH = 170
+CARD_CELL_HEIGHT = 240
+
+
+# === Recarrega o índice de busca a partir da biblioteca ===
+def load_games(rescan=False):
+    global search_index
+    search_index = library_index(search_game(rescan=rescan))
+    return search_index.search(current_term)
 
 
 # === Atualiza lista de jogos ===
 def refresh_callback():
-    display_games(search_game())
+    display_games(load_games(rescan=True), keep_scroll=True)
 
 
-# === Exibe jogos dinamicamente ===
-def display_games(game_list, columns=6):
-    global images
-    images = []
+# === Sessão de jogo: bloqueia novos lançamentos enquanto o PCSX2 roda ===
+def launch_game(arquivo, title):
+    global session
+    if session is not None:
+        print(f"[WARN] {GAME_ALREADY_RUNNING}")
+        return
+    session = start_game(
+        arquivo,
+        root,
+        on_start=lambda s: on_session_start(title),
+        on_end=lambda s: on_session_end(),
+    )
 
-    for w in game_frame.winfo_children():
-        w.destroy()
 
-    scroll = ctk.CTkScrollableFrame(game_frame, fg_color=BACKGROUND_DARK)
-    scroll.pack(fill="both", expand=True)
+def on_session_start(title):
+    if session_label is not None:
+        session_label.configure(text=GAME_PLAYING_STATUS.format(jogo=title))
 
-    if not game_list:
-        ctk.CTkLabel(
-            scroll,
-            text=NO_GAMES_FOUND,
-            text_color=TEXT_SECONDARY,
-            font=(FONT_FAMILY, FONT_SIZE_LG, FONT_WEIGHT_BOLD),
-        ).pack(pady=50)
-        return
 
-    for idx, item in enumerate(game_list):
-        card = GameCard(
-            parent=scroll,
-            title=item["title"],
-            image=item["image"],
-            platform="ps1",
-            on_click=lambda f=item["file"]: start_game(f),
-            on_edit=lambda f=item["title"]: change_cover(f, refresh_callback),
-            on_delete=lambda f=item["title"]: delete_game(f, refresh_callback),
+def on_session_end():
+    global session
+    session = None
+    if session_label is not None:
+        session_label.configure(text="")
+
+
+def bind_card(card, item, index):
+    card.set_game(
+        title=item["title"],
+        image=item["image"],
+        on_click=lambda f=item["file"], t=item["title"]: launch_game(f, t),
+        on_edit=lambda f=item["title"]: change_cover(f, refresh_callback),
+        on_delete=lambda f=item["title"]: delete_game(f, refresh_callback),
+        priority=index,
+        on_hover=lambda f=item["file"]: prewarm_game(f),
+    )
+
+
+# === Exibe jogos (grid virtualizado, só as linhas visíveis viram widgets) ===
+def display_games(game_list, columns=6, keep_scroll=False):
+    global grid
+
+    if grid is None or not grid.winfo_exists():
+        grid = VirtualGrid(
+            game_frame,
+            create_item=lambda parent: GameCard(parent, platform="ps1"),
+            bind_item=bind_card,
+            release_item=lambda card: card.release(),
+            cell_width=CARD_CELL_WIDTH,
+            cell_height=CARD_CELL_HEIGHT,
+            columns=columns,
+            overscan=1,
+            key=lambda item: item["file"],
         )
-        card.grid(row=idx // columns, column=idx % columns, padx=10, pady=10)
+        grid.pack(fill="both", expand=True)
+
+    grid.columns = columns
+    grid.set_items(game_list, keep_scroll=keep_scroll)
+
+
+# === Aplica delta do watcher ===
+def apply_library_delta(delta):
+    # Só os arquivos do delta são relidos e reindexados; o grid reconcilia por arquivo
+    search_index.remove(delta["removed"])
+    games = get_games([g["file"] for g in delta["added"] + delta["changed"]])
+    search_index.add([game for game in games if not search_index.replace(game)])
+    display_games(
+        search_index.search(current_term), columns=grid.columns if grid else 6, keep_scroll=True
+    )
+
+
+# === Força nova varredura completa (botão de refresh) ===
+def refresh_library():
+    update_library(force=True)
+    display_games(load_games(), keep_scroll=True)
 
 
 def open_control_settings():
+    # pygame só é carregado quando a tela de controles é aberta
+    from ui.control_settings import ControlSettings
+
     ControlSettings(root)
 
 
 # === Tela principal ===
-def start_home():
-    global root, game_frame
+def start_home(warm_state=None):
+    """`warm_state` (services.warmup) traz biblioteca e índice já prontos do splash."""
+    global root, game_frame, watcher, search_index, session_label
     root = create_window(title=APP_NAME)
 
     # === Ícones ===
@@ -82,16 +148,22 @@ def start_home():
 
     # === Campo de busca ===
     def filter_games(term):
-        term = term.lower().strip()
-        if not term:
-            display_games(search_game())
-        else:
-            filtered = [g for g in search_game() if term in g["title"].lower()]
-            display_games(filtered)
+        global current_term
+        current_term = term
+        display_games(search_index.search(term))
 
     search_input = SearchInput(header, on_change=filter_games)
     search_input.pack(side="left", padx=10)
 
+    # === Estado da sessão de jogo ===
+    session_label = ctk.CTkLabel(
+        header,
+        text="",
+        text_color=TEXT_SECONDARY,
+        font=(FONT_FAMILY, FONT_SIZE_MD),
+    )
+    session_label.pack(side="left", padx=10)
+
     # === Drawer (Loja lateral) ===
     # drawer = ctk.CTkFrame(main_frame, fg_color=SURFACE, width=0)
     # drawer.pack(side="right", fill="y")
@@ -131,7 +203,7 @@ def start_home():
 
     # Botões dentro do frame
     create_icon_button(config_frame, icon_config, open_control_settings)
-    create_icon_button(config_frame, icon_refresh, lambda: display_games(search_game()))
+    create_icon_button(config_frame, icon_refresh, refresh_library)
 
     # === Título da seção ===
     ctk.CTkLabel(
@@ -146,9 +218,24 @@ def start_home():
     game_frame.pack(fill="both", expand=True, padx=10, pady=(0, 5))
 
     # === Render inicial ===
-    display_games(search_game())
+    if warm_state:
+        search_index = warm_state.index
+        display_games(search_index.search(current_term))
+    else:
+        display_games(load_games(rescan=True))
+
+    # === Watcher de /roms e /covers ===
+    watcher = LibraryWatcher(lambda delta: root.after(0, lambda: apply_library_delta(delta)))
+    watcher.start()
+    root.bind("<Destroy>", lambda e: watcher.stop() if e.widget is root else None, add="+")
 
     # === Rodapé ===
     create_footer(root)
 
+    def on_ready():
+        startup.mark("home")
+        startup.finish(root)
+
+    root.after(0, on_ready)
+
     root.mainloop()
@@ -3,13 +3,16 @@ import threading
 
 import customtkinter as ctk
 from PIL import Image
-from ui.home import start_home
+from utils import startup
 from utils.constants import *
-from utils.paths import get_asset_path, get_cover_path, get_rom_path
-from utils.setup import prepare_emulator
+from utils.paths import get_asset_path
 from utils.theme import *
 
 
+# Espera máxima pelo aquecimento depois do setup; passado isso a home carrega sozinha
+WARMUP_TIMEOUT = 10
+
+
 def start_init():
     window = create_window(
         title=APP_NAME,
@@ -61,18 +64,32 @@ def start_init():
 
     # === CALLBACKS VISUAIS ===
     def update_progress(value: float):
-        window.after(0, lambda: progress_bar.set(value))
+        def apply():
+            # Primeiro progresso real troca a animação pela barra determinada
+            if progress_bar.cget("mode") != "determinate":
+                progress_bar.stop()
+                progress_bar.configure(mode="determinate")
+            progress_bar.set(value)
+
+        window.after(0, apply)
 
     def update_status(text: str):
         window.after(0, lambda: status_label.configure(text=text))
 
     # === FLUXO DE INICIALIZAÇÃO ===
     def prepare():
-        os.makedirs(get_rom_path(""), exist_ok=True)
-        os.makedirs(get_cover_path(""), exist_ok=True)
+        # Setup e tela inicial só são importados aqui, com o splash já na tela
+        from services.warmup import start_warmup
+        from utils.setup import prepare_emulator
+
+        # Biblioteca, ícones e primeira tela de capas aquecem junto com o setup
+        warmup = start_warmup()
 
         update_status(STATUS_LOADING)
         prepare_emulator(progress_callback=update_progress, status_callback=update_status)
+        from ui.home import start_home
+
+        warm_state = warmup.wait(WARMUP_TIMEOUT)
 
         def close_window():
             try:
@@ -88,11 +105,12 @@ def start_init():
 
             if window.winfo_exists():
                 window.destroy()
-            start_home()
+            start_home(warm_state)
 
-        # Fecha a janela após 1 segundo
-        window.after(1000, close_window)
+        # Fecha assim que o setup termina (sem espera fixa)
+        window.after(0, close_window)
 
+    window.after(0, lambda: startup.mark("splash"))
     threading.Thread(target=prepare, daemon=True).start()
     window.mainloop()
 
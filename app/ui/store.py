@@ -1,15 +1,19 @@
-import json
 import os
-import zipfile
+import queue
+import threading
 from tkinter import messagebox
 
 import customtkinter as ctk
-import gdown
+from services.catalog import Catalog, get_catalog_path, iter_catalog_pages
+from services.search import SearchIndex
 from ui.components.game_store_card import GameStoreCard
 from ui.components.search_input import SearchInput
+from ui.components.virtual_grid import VirtualGrid
 from utils.constants import *
 from utils.icons import load_icons
-from utils.paths import get_rom_path
+
+STORE_ROW_HEIGHT = 82  # card de 70px + 6px de espaçamento em cima e embaixo
+CATALOG_DRAIN_MS = 50
 
 
 def build_store_drawer(frame, refresh_callback=None):
@@ -31,37 +35,44 @@ def build_store_drawer(frame, refresh_callback=None):
     header_inner = ctk.CTkFrame(header, fg_color="transparent")
     header_inner.pack(fill="x", expand=True, padx=20, pady=10)
 
-    # === Atualizar lista de jogos via Google Drive ===
-    def update_game_list():
-        try:
-            rom_dir = get_rom_path("")
-            zip_path = os.path.join(rom_dir, "games.zip")
-
-            update_log(STATUS_UPDATING_LIST)
-
-            file_id = "1kK8h2n9696iZH9pN5HV2KTIwYHj5W2p3"
-            url = f"https://drive.google.com/uc?id={file_id}"
-
-            # Baixar o arquivo ZIP
-            gdown.download(url, zip_path, quiet=False, fuzzy=True)
+    # === Atualizar lista de jogos (requisição condicional/delta, em segundo plano) ===
+    syncing = False
 
-            if not os.path.exists(zip_path):
-                raise FileNotFoundError(FILE_NOT_FOUND.format(nome="games.zip"))
-
-            # Extrair o JSON dentro de /roms
-            with zipfile.ZipFile(zip_path, "r") as zip_ref:
-                zip_ref.extractall(rom_dir)
-            os.remove(zip_path)
-
-            update_log(STATUS_UPDATE_SUCCESS)
-
-            # Recarregar lista após atualização
-            nonlocal all_games
-            all_games = load_local_list()
-            filter_and_display()
-
-        except Exception as e:
-            messagebox.showerror("Erro", STATUS_UPDATE_ERROR + f"\n{e}")
+    def update_game_list():
+        nonlocal syncing
+        if syncing:
+            return
+        syncing = True
+        update_log(STATUS_UPDATING_LIST)
+
+        def on_progress(value):
+            frame.after(0, lambda: update_log(STATUS_UPDATE_PROGRESS.format(pct=int(value * 100))))
+
+        def finish(result, error=None):
+            nonlocal syncing
+            syncing = False
+            if not frame.winfo_exists():
+                return
+            if error is not None:
+                update_log(STATUS_UPDATE_ERROR)
+                messagebox.showerror("Erro", STATUS_UPDATE_ERROR + f"\n{error}")
+            elif result == "unchanged":
+                update_log(STATUS_LIST_UNCHANGED)
+            else:
+                update_log(STATUS_UPDATE_SUCCESS)
+                # Recarregar lista após atualização
+                load_local_list()
+
+        def run():
+            try:
+                from services.catalog_sync import sync_catalog
+
+                result = sync_catalog(progress_callback=on_progress)
+                frame.after(0, lambda: finish(result))
+            except Exception as e:
+                frame.after(0, lambda: finish(None, e))
+
+        threading.Thread(target=run, daemon=True).start()
 
     # --- Campo de busca ---
     def on_search_change(text: str):
@@ -74,9 +85,23 @@ def build_store_drawer(frame, refresh_callback=None):
     )
     search_input.pack(side="left", fill="x", expand=True)
 
-    # --- SCROLL CONTAINER ---
-    frame_scroll = ctk.CTkScrollableFrame(frame, fg_color="#121212", corner_radius=12)
-    frame_scroll.pack(fill="both", expand=True, padx=10, pady=5)
+    # --- LISTA VIRTUALIZADA (só as linhas visíveis viram widgets) ---
+    game_list = VirtualGrid(
+        frame,
+        create_item=lambda parent: GameStoreCard(parent, None, icons, update_log, refresh_callback),
+        bind_item=lambda card, index, _pos: card.set_game(catalog.entry(index)),
+        cell_width=1,
+        cell_height=STORE_ROW_HEIGHT,
+        columns=1,
+        overscan=2,
+        padx=10,
+        pady=6,
+        stretch=True,
+        fg_color="#121212",
+        # Itens já são posições estáveis do catálogo; nomes podem se repetir
+        key=lambda index: index,
+    )
+    game_list.pack(fill="both", expand=True, padx=10, pady=5)
 
     # --- LABEL DE STATUS ---
     status_label = ctk.CTkLabel(frame, text="", font=("Segoe UI", 12), text_color="gray")
@@ -86,54 +111,83 @@ def build_store_drawer(frame, refresh_callback=None):
         status_label.configure(text=msg)
         status_label.update_idletasks()
 
-    # === Carregar lista local ===
-    def load_local_list():
-        try:
-            json_path = os.path.join(get_rom_path(""), "games.json")
-
-            if not os.path.exists(json_path):
-                messagebox.showerror("Erro", FILE_NOT_FOUND.format(nome="games.json"))
-                return []
-
-            with open(json_path, encoding="utf-8") as f:
-                data = json.load(f)
+    # === Carregar lista local (em páginas, lidas numa thread) ===
+    load_generation = 0
 
-            if not isinstance(data, list):
-                messagebox.showerror("Erro", INVALID_JSON)
-                return []
-
-            valid_games = [j for j in data if all(k in j for k in ("game", "name", "size"))]
-            return valid_games
+    def load_local_list():
+        nonlocal catalog, catalog_index, load_generation
+        load_generation += 1
+        generation = load_generation
+        catalog = Catalog()
+        catalog_index = SearchIndex()
+        game_list.reset()
+
+        json_path = get_catalog_path()
+        if not os.path.exists(json_path):
+            messagebox.showerror("Erro", FILE_NOT_FOUND.format(nome="games.json"))
+            filter_and_display(search_input.get_value())
+            return
 
-        except Exception as e:
-            messagebox.showerror("Erro", JSON_LOAD_ERROR.format(erro=e))
-            return []
+        pages = queue.Queue()
+
+        def reader():
+            try:
+                for page in iter_catalog_pages(json_path):
+                    if generation != load_generation:
+                        return
+                    pages.put(page)
+                pages.put(None)
+            except Exception as e:
+                pages.put(e)
+
+        def drain():
+            if generation != load_generation or not frame.winfo_exists():
+                return
+
+            done = False
+            received = False
+            try:
+                while True:
+                    page = pages.get_nowait()
+                    if page is None:
+                        done = True
+                        break
+                    if isinstance(page, ValueError):
+                        messagebox.showerror("Erro", INVALID_JSON)
+                        done = True
+                        break
+                    if isinstance(page, Exception):
+                        messagebox.showerror("Erro", JSON_LOAD_ERROR.format(erro=page))
+                        done = True
+                        break
+                    start = len(catalog)
+                    catalog.extend(page)
+                    catalog_index.add(range(start, len(catalog)), keys=page.keys)
+                    received = True
+            except queue.Empty:
+                pass
+
+            # Primeira página já aparece enquanto o resto do arquivo é lido
+            if received or done:
+                filter_and_display(search_input.get_value(), keep_scroll=True)
+            if not done:
+                frame.after(CATALOG_DRAIN_MS, drain)
+
+        threading.Thread(target=reader, daemon=True).start()
+        frame.after(CATALOG_DRAIN_MS, drain)
 
     # === Renderizar jogos ===
-    def render_game_list(games):
-        for widget in frame_scroll.winfo_children():
-            widget.destroy()
-
-        if not games:
-            ctk.CTkLabel(
-                frame_scroll,
-                text=NO_GAMES_FOUND,
-                font=("Segoe UI", 14),
-                text_color="#888",
-            ).pack(pady=20)
-            return
-
-        for game in games:
-            GameStoreCard(frame_scroll, game, icons, update_log, refresh_callback)
+    def render_game_list(games, keep_scroll=False):
+        game_list.set_items(games, keep_scroll=keep_scroll)
 
-    # === Buscar e listar ===
-    all_games = load_local_list()
+    # === Buscar e listar (índice normalizado sobre as posições do catálogo) ===
+    catalog = Catalog()
+    catalog_index = SearchIndex()
 
-    def filter_and_display(filter_text=""):
-        search_term = filter_text.strip().lower()
-        filtered = [g for g in all_games if search_term in g.get("name", "").lower()]
+    def filter_and_display(filter_text="", keep_scroll=False):
+        filtered = catalog_index.search(filter_text)
         status_label.configure(text=f"{len(filtered)} jogo(s) encontrado(s)")
-        render_game_list(filtered)
+        render_game_list(filtered, keep_scroll=keep_scroll)
 
     # === Render inicial ===
-    filter_and_display()
+    load_local_list()
@@ -0,0 +1,93 @@
+import copy
+import json
+import os
+import threading
+
+from .paths import get_external_root
+
+CONFIG_FILE = "config.json"
+
+# === Valores padrão (sobrescritos por config.json na raiz, ao lado de /roms) ===
+DEFAULTS = {
+    "catalog": {
+        "url": "https://drive.google.com/uc?export=download&id=1kK8h2n9696iZH9pN5HV2KTIwYHj5W2p3",
+        "timeout": 30,
+    },
+    "session": {
+        "minimize": True,  # minimiza o launcher enquanto o jogo roda
+    },
+    "startup": {
+        # Orçamento (ms desde o início do processo) para AX2_STARTUP_CHECK=1
+        "splash": 1500,
+        "home": 4000,
+    },
+    "emulator": {
+        "url": "https://github.com/PCSX2/pcsx2/releases/download/v2.4.0/pcsx2-v2.4.0-windows-x64-Qt.7z",
+        "sha1": "",  # opcional: confere o pacote durante o download
+        "bytes": 0,
+        "exclude": ["*.pdb"],  # arquivos do pacote que não são extraídos
+    },
+    "http": {
+        "connect_timeout": 10,
+        "read_timeout": 30,
+        "pool_connections": 8,
+        "pool_maxsize": 16,
+        "per_host": 8,  # a última vaga de cada host fica reservada para capas/catálogo
+        "hosts": {},  # limite por host, ex.: {"drive.usercontent.google.com": 4}
+        "proxies": {},  # ex.: {"https": "http://proxy:3128"}
+        "user_agent": "Ax2",
+    },
+    "transfers": {
+        "global_rate": 0,  # bytes/s, 0 = sem limite
+        "job_rate": 0,  # limite por download de ROM
+        "bulk_yield_rate": 256 * 1024,  # ROMs enquanto catálogo/capas baixam
+        "schedule": [],  # ex.: [{"from": "09:00", "to": "18:00", "rate": 1048576}]
+    },
+    "downloads": {
+        "parallel": 2,
+        "retries": 3,
+        "backoff": 2.0,
+        "chunk_size": 256 * 1024,
+        "timeout": 30,
+        "progress_interval": 0.5,
+        "segments": 4,
+        "min_segment_size": 8 * 1024 * 1024,
+    },
+    "prewarm": {
+        # Lê cabeçalho, mapa de hunks e o início da ROM antes do PCSX2 pedir
+        "enabled": True,
+        "first_mb": 64,
+        "hover_delay_ms": 150,  # hover rápido pelo grid não dispara leitura
+        # Por pasta da biblioteca, ex.: {"Z:/roms": {"first_mb": 256}, "D:/roms": {"enabled": false}}
+        "roots": {},
+    },
+}
+
+_config = None
+_lock = threading.Lock()
+
+
+def _merge(base, override):
+    for key, value in override.items():
+        if isinstance(value, dict) and isinstance(base.get(key), dict):
+            _merge(base[key], value)
+        else:
+            base[key] = value
+    return base
+
+
+def get_config(section: str = None):
+    """Configuração efetiva (DEFAULTS + config.json); lida uma vez por processo."""
+    global _config
+    with _lock:
+        if _config is None:
+            _config = copy.deepcopy(DEFAULTS)
+            path = os.path.join(get_external_root(), CONFIG_FILE)
+            try:
+                with open(path, encoding="utf-8") as f:
+                    _merge(_config, json.load(f))
+            except FileNotFoundError:
+                pass
+            except (OSError, ValueError) as e:
+                print(f"[WARN] Falha ao ler {CONFIG_FILE}: {e}")
+    return _config.get(section, {}) if section else _config
@@ -14,10 +14,14 @@ STATUS_READY = "Axis instalado e pronto!"
 STATUS_UPDATING_LIST = "🔄 Atualizando lista de jogos..."
 STATUS_UPDATE_SUCCESS = "✅ Lista de jogos atualizada com sucesso!"
 STATUS_UPDATE_ERROR = "❌ Falha ao atualizar lista de jogos."
+STATUS_LIST_UNCHANGED = "✅ Lista de jogos já está atualizada."
+STATUS_UPDATE_PROGRESS = "🔄 Atualizando lista de jogos... {pct}%"
 
 # === 🎮 Mensagens relacionadas a jogos ===
 GAME_START_INFO = "[INFO] Jogo iniciado. Pressione ESC ou L1+X para sair."
 GAME_START_ERROR = "Falha ao iniciar o jogo:\n{erro}"
+GAME_ALREADY_RUNNING = "Já existe um jogo em execução."
+GAME_PLAYING_STATUS = "🎮 Jogando: {jogo}"
 GAME_NOT_FOUND = "O jogo '{arquivo}' não foi encontrado em /roms."
 EMU_NOT_FOUND = "DuckStation não encontrado na pasta /game."
 GAME_DELETE_CONFIRM = "Deseja realmente excluir '{jogo}'?\nA ROM e a capa serão removidas."
@@ -1,78 +1,113 @@
 import os
-import subprocess
-import time
 from tkinter import filedialog, messagebox
 
-import keyboard
-import pygame
-from PIL import Image
+from services.installed import installed_games
+from services.library import invalidate_library, list_games, update_library
 from utils.constants import *
 
+from .manifest import exe_path, invalidate_manifest, read_manifest
 from .paths import get_cover_path, get_emulator_path, get_rom_path
 
 
-def start_game(arquivo):
+# Caminho do executável resolvido uma vez por processo (sem listdir/stat a cada clique)
+_emulator_exe = None
+
+
+def find_emulator_exe(refresh=False):
+    """
+    Executável do PCSX2 registrado no manifesto de instalação (em cache).
+    Sem manifesto, ou com `refresh` e o arquivo sumido, procura em /game.
+    """
+    global _emulator_exe
+    if _emulator_exe is None or refresh:
+        manifest = read_manifest()
+        path = exe_path(manifest) if manifest and manifest.get("exe") else None
+        if path is None or (refresh and not os.path.isfile(path)):
+            path = _scan_emulator_dir()
+        _emulator_exe = path
+    return _emulator_exe
+
+
+def _scan_emulator_dir():
+    pcsx2_dir = get_emulator_path("")
     try:
-        pcsx2_dir = get_emulator_path("")
-        pcsx2_exe = next(
-            (
-                os.path.join(pcsx2_dir, f)
-                for f in os.listdir(pcsx2_dir)
-                if f.lower().startswith("pcsx2") and f.lower().endswith(".exe")
-            ),
-            None,
-        )
+        names = os.listdir(pcsx2_dir)
+    except OSError:
+        names = []
+    return next(
+        (
+            os.path.join(pcsx2_dir, f)
+            for f in names
+            if f.lower().startswith("pcsx2") and f.lower().endswith(".exe")
+        ),
+        None,
+    )
+
+
+def prewarm_game(arquivo):
+    """Começa a puxar a ROM para o cache (hover/seleção do card, antes do clique)."""
+    from services.prewarm import prewarmer
+
+    try:
+        return prewarmer.warm(get_rom_path(arquivo))
+    except Exception as e:
+        print(f"[WARN] Falha ao pré-aquecer '{arquivo}': {e}")
+        return None
+
 
-        if not pcsx2_exe or not os.path.exists(pcsx2_exe):
+def start_game(arquivo, root=None, on_start=None, on_end=None):
+    """Valida e inicia o jogo numa GameSession; retorna sem esperar o emulador fechar."""
+    from services.launch_history import LaunchTrace
+    from services.session import GameSession, current_session
+
+    if current_session() is not None:
+        print(f"[WARN] {GAME_ALREADY_RUNNING}")
+        return None
+
+    trace = LaunchTrace(arquivo)
+    try:
+        with trace.span("discovery"):
+            pcsx2_exe = find_emulator_exe()
+
+        if not pcsx2_exe:
+            # Instalação mudou por fora: próximo início revalida tudo
+            invalidate_manifest()
+            trace.finish("no_emulator")
             messagebox.showerror("Erro", "PCSX2 não encontrado em /game/.")
-            return
+            return None
 
-        rom = get_rom_path(arquivo)
-        if not os.path.exists(rom):
+        with trace.span("rom_check"):
+            rom = get_rom_path(arquivo)
+            rom_ok = os.path.exists(rom)
+        if not rom_ok:
+            trace.finish("no_rom")
             messagebox.showerror("Erro", GAME_NOT_FOUND.format(arquivo=arquivo))
-            return
-
-        process = subprocess.Popen([pcsx2_exe, "-nogui", "-batch", "-fullscreen", "--", rom])
-        print(GAME_START_INFO)
-
-        pygame.init()
-        pygame.joystick.init()
-        joystick = pygame.joystick.Joystick(0) if pygame.joystick.get_count() else None
-
-        if joystick:
-            print(INFO_CONTROLLER_DETECTED.format(nome=joystick.get_name()))
-        else:
-            print(WARN_NO_CONTROLLER)
-
-        combo_start, combo_duration = None, 1.0
-        btn_x, btn_l1 = 2, 4
-
-        while process.poll() is None:
-            if keyboard.is_pressed("esc"):
-                process.terminate()
-                break
-
-            if joystick:
-                pygame.event.pump()
-                if joystick.get_button(btn_l1) and joystick.get_button(btn_x):
-                    if combo_start is None:
-                        combo_start = time.time()
-                    elif time.time() - combo_start >= combo_duration:
-                        print(INFO_COMBO_EXIT)
-                        process.terminate()
-                        break
-                else:
-                    combo_start = None
-            time.sleep(0.05)
-
-        pygame.quit()
+            return None
+
+        # Leitura do início da ROM corre junto com a abertura do emulador
+        prewarm_game(arquivo)
+
+        try:
+            return GameSession(pcsx2_exe, rom, root, on_start, on_end, trace).start()
+        except OSError:
+            # Executável em cache sumiu ou foi trocado: busca de novo uma vez
+            invalidate_manifest()
+            pcsx2_exe = find_emulator_exe(refresh=True)
+            if not pcsx2_exe:
+                trace.finish("no_emulator")
+                messagebox.showerror("Erro", "PCSX2 não encontrado em /game/.")
+                return None
+            return GameSession(pcsx2_exe, rom, root, on_start, on_end, trace).start()
 
     except Exception as e:
-        pygame.quit()
+        trace.finish("failed")
         messagebox.showerror("Erro", GAME_START_ERROR.format(erro=e))
+        return None
 
 
 def change_cover(nome_jogo, refresh_callback=None):
+    from PIL import Image
+
     try:
         arquivo_img = filedialog.askopenfilename(
             title=COVER_SELECT_TITLE.format(jogo=nome_jogo),
@@ -83,6 +118,8 @@ def change_cover(nome_jogo, refresh_callback=None):
 
         destino = get_cover_path(f"{nome_jogo}.png")
         Image.open(arquivo_img).convert("RGBA").save(destino, "PNG")
+        # Sobrescrever a capa não muda o mtime de /covers
+        invalidate_library()
 
         messagebox.showinfo("Capa atualizada", COVER_UPDATED.format(jogo=nome_jogo))
         if refresh_callback:
@@ -105,6 +142,7 @@ def delete_game(nome_jogo, refresh_callback=None):
         capa = get_cover_path(f"{nome_jogo}.png")
         if os.path.exists(capa):
             os.remove(capa)
+        installed_games.discard(nome_jogo)
 
         messagebox.showinfo("Removido", GAME_DELETE_SUCCESS.format(jogo=nome_jogo))
         if refresh_callback:
@@ -114,13 +152,8 @@ def delete_game(nome_jogo, refresh_callback=None):
         messagebox.showerror("Erro", GAME_DELETE_ERROR.format(erro=e))
 
 
-def search_game():
-    jogos = []
-    for f in os.listdir(get_rom_path("")):
-        if f.lower().endswith((".bin", ".iso", ".img", ".cue", ".chd")):
-            title = os.path.splitext(f)[0]
-            capa = (
-                f"{title}.png" if os.path.isfile(get_cover_path(f"{title}.png")) else "default.png"
-            )
-            jogos.append({"title": title, "file": f, "image": capa})
-    return jogos
+def search_game(term="", rescan=False):
+    # Lê do índice persistente; rescan sincroniza antes com /roms e /covers.
+    if rescan:
+        update_library()
+    return list_games(term)
@@ -1,35 +1,114 @@
+import threading
+
 from customtkinter import CTkImage
 from PIL import Image
 
-from .paths import get_button_path, get_icon_path
+from .paths import get_asset_path, get_button_path, get_icon_path
 
+# === Registro de assets: cada arquivo é decodificado uma vez por tamanho ===
+_resolvers = {
+    "icon": get_icon_path,
+    "button": get_button_path,
+    "asset": get_asset_path,
+}
+_pil_images = {}  # (tipo, nome, tamanho|None) -> PIL.Image
+_ctk_images = {}  # (tipo, nome, tamanho) -> CTkImage
+_icons = None
+_lock = threading.Lock()
 
-def load_ctk_image(name: str, size=(24, 24)):
+ICON_SET = {
+    "refresh": ("icon_refresh.png", (32, 32)),
+    "search": ("icon_search.png", (32, 32)),
+    "edit": ("icon_edit.png", (24, 24)),
+    "trash": ("icon_trash.png", (24, 24)),
+    "download": ("icon_download.png", (32, 32)),
+    "config": ("icon_settings.png", (32, 32)),
+    "check": ("icon_check.png", (40, 40)),
+    "store": ("icon_store.png", (32, 32)),
+    "auto": ("icon_auto.png", (32, 32)),
+    "clear": ("icon_clear.png", (32, 32)),
+}
+
+# Assets decodificados em segundo plano durante o splash
+PRELOAD_ASSETS = [("icon", name, None) for name, _ in ICON_SET.values()] + [
+    ("asset", "ps1_path.png", None),
+    ("asset", "joystick.png", None),
+]
+
+
+def _load_pil(kind: str, name: str, size=None):
+    key = (kind, name, tuple(size) if size else None)
+    img = _pil_images.get(key)
+    if img is not None:
+        return img
+
+    if size:
+        img = _load_pil(kind, name).resize(tuple(size), Image.LANCZOS)
+    else:
+        img = Image.open(_resolvers[kind](name))
+        img.load()
+
+    with _lock:
+        return _pil_images.setdefault(key, img)
+
+
+def _load_ctk(kind: str, name: str, size):
+    key = (kind, name, tuple(size))
+    image = _ctk_images.get(key)
+    if image is not None:
+        return image
     try:
-        img = Image.open(get_icon_path(name))
-        return CTkImage(light_image=img, dark_image=img, size=size)
+        img = _load_pil(kind, name)
     except Exception:
         return None
+    image = CTkImage(light_image=img, dark_image=img, size=size)
+    with _lock:
+        return _ctk_images.setdefault(key, image)
+
+
+def get_asset_image(name: str, size=None):
+    """PIL.Image RGBA compartilhado de app/assets (ex.: moldura ps1_path.png)."""
+    key = ("asset", f"{name}#rgba", tuple(size) if size else None)
+    img = _pil_images.get(key)
+    if img is None:
+        if size:
+            img = get_asset_image(name).resize(tuple(size), Image.LANCZOS)
+        else:
+            img = _load_pil("asset", name).convert("RGBA")
+        with _lock:
+            img = _pil_images.setdefault(key, img)
+    return img
+
+
+def load_asset_image(name: str, size):
+    return _load_ctk("asset", name, size)
+
+
+def load_ctk_image(name: str, size=(24, 24)):
+    return _load_ctk("icon", name, size)
 
 
 def load_button_image(name: str, size=(24, 24)):
-    try:
-        img = Image.open(get_button_path(name))
-        return CTkImage(light_image=img, dark_image=img, size=size)
-    except Exception:
-        return None
+    return _load_ctk("button", name, size)
 
 
 def load_icons():
-    return {
-        "refresh": load_ctk_image("icon_refresh.png", (32, 32)),
-        "search": load_ctk_image("icon_search.png", (32, 32)),
-        "edit": load_ctk_image("icon_edit.png", (24, 24)),
-        "trash": load_ctk_image("icon_trash.png", (24, 24)),
-        "download": load_ctk_image("icon_download.png", (32, 32)),
-        "config": load_ctk_image("icon_settings.png", (32, 32)),
-        "check": load_ctk_image("icon_check.png", (40, 40)),
-        "store": load_ctk_image("icon_store.png", (32, 32)),
-        "auto": load_ctk_image("icon_auto.png", (32, 32)),
-        "clear": load_ctk_image("icon_clear.png", (32, 32)),
-    }
+    global _icons
+    if _icons is None:
+        _icons = {key: load_ctk_image(name, size) for key, (name, size) in ICON_SET.items()}
+    return _icons
+
+
+def preload_assets(assets=None):
+    """Decodifica os assets declarados numa thread (CTkImage fica para o Tk)."""
+
+    def run():
+        for kind, name, size in assets or PRELOAD_ASSETS:
+            try:
+                _load_pil(kind, name, size)
+            except Exception as e:
+                print(f"[WARN] Falha ao pré-carregar {name}: {e}")
+
+    thread = threading.Thread(target=run, daemon=True)
+    thread.start()
+    return thread
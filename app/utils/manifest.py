@@ -0,0 +1,101 @@
+import json
+import os
+import time
+
+from .paths import get_emulator_path, get_external_root
+
+MANIFEST_FILE = "ax2_manifest.json"
+# Incrementar ao mudar o que o prepare_emulator instala: força revalidação completa
+MANIFEST_VERSION = 2
+
+
+def _manifest_path():
+    return get_emulator_path(MANIFEST_FILE)
+
+
+def file_entry(path):
+    """{"size"} de um arquivo instalado; o início a quente só compara tamanhos (sem hash)."""
+    return {"size": os.path.getsize(path)}
+
+
+def read_manifest():
+    """Conteúdo de game/ax2_manifest.json, sem validar (None se não existe ou está corrompido)."""
+    try:
+        with open(_manifest_path(), encoding="utf-8") as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return None
+    return manifest if isinstance(manifest, dict) else None
+
+
+def changed_files(manifest):
+    """
+    Arquivos do manifesto (relativos à raiz, ex.: "game/pcsx2-qt.exe") que
+    sumiram ou mudaram de tamanho. Só stat, sem reler conteúdo.
+    """
+    root = get_external_root()
+    changed = []
+    for rel, entry in (manifest.get("files") or {}).items():
+        try:
+            size = os.path.getsize(os.path.join(root, rel))
+        except OSError:
+            size = None
+        if size != entry.get("size"):
+            changed.append(rel)
+    return changed
+
+
+def exe_path(manifest):
+    """Caminho absoluto do executável registrado no manifesto."""
+    return get_emulator_path(manifest["exe"])
+
+
+def load_manifest(layout):
+    """
+    Lê game/ax2_manifest.json numa única leitura e confere com stat o
+    executável e os arquivos registrados.
+
+    Retorna None se não existir, estiver corrompido, tiver sido gravado
+    para outra versão/instalação (`layout` muda com URL do emulador, lista
+    de arquivos padrão etc.) ou algum arquivo sumiu/mudou de tamanho —
+    nesse caso o setup revalida tudo.
+    """
+    manifest = read_manifest()
+    if (
+        manifest is None
+        or manifest.get("version") != MANIFEST_VERSION
+        or manifest.get("layout") != layout
+        or not manifest.get("exe")
+        or not os.path.isfile(exe_path(manifest))
+        or changed_files(manifest)
+    ):
+        return None
+    return manifest
+
+
+def write_manifest(layout, exe, files, emulator=None):
+    manifest = {
+        "version": MANIFEST_VERSION,
+        "layout": layout,
+        "created": int(time.time()),
+        "exe": exe,
+        "emulator": emulator or {},
+        "files": files,
+    }
+    path = _manifest_path()
+    tmp_path = path + ".tmp"
+    try:
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(manifest, f, indent=2)
+        os.replace(tmp_path, path)
+    except OSError as e:
+        print(f"[WARN] Falha ao salvar manifesto da instalação: {e}")
+    return manifest
+
+
+def invalidate_manifest():
+    """Força revalidação completa no próximo início (ex.: executável sumiu)."""
+    try:
+        os.remove(_manifest_path())
+    except OSError:
+        pass
@@ -67,3 +67,9 @@ def get_emulator_path(name: str = ""):
     path = os.path.join(get_external_root(), "game")
     os.makedirs(path, exist_ok=True)
     return os.path.join(path, name)
+
+
+def get_cache_path(name: str = ""):
+    path = os.path.join(get_external_root(), "cache")
+    os.makedirs(path, exist_ok=True)
+    return os.path.join(path, name)
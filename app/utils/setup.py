@@ -1,23 +1,64 @@
+import fnmatch
+import hashlib
+import json
 import os
 import shutil
+import threading
 
-import py7zr
-import requests
+from services.integrity import StreamHasher, normalize_expected, verify_download
+from utils.config import get_config
 from utils.constants import *
-from utils.theme import *
 
-from .paths import get_cover_path, get_emulator_path, get_rom_path, get_setting_path
+from .manifest import file_entry, load_manifest, write_manifest
+from .paths import (
+    get_cover_path,
+    get_emulator_path,
+    get_external_root,
+    get_rom_path,
+    get_setting_path,
+)
+
+
+BIOS_FILES = [
+    "scph10000-jp.bin",
+    "scph50009-cn.bin",
+    "scph77001-us.bin",
+    "scph77004-eu.bin",
+]
+
+# Bootstrap do PCSX2: download e extração em /game/.staging antes da troca
+STAGING_DIR = ".staging"
+DOWNLOAD_WEIGHT = 0.7  # fração da barra do splash usada pelo download
+
+
+def _layout():
+    # Muda quando muda o que é instalado: invalida manifestos antigos
+    config = get_config("emulator")
+    key = json.dumps([config["url"], config["exclude"], BIOS_FILES])
+    return hashlib.sha1(key.encode("utf-8")).hexdigest()[:16]
 
 
 def prepare_emulator(progress_callback=None, status_callback=None):
+    """
+    Prepara /game, /roms e /covers e garante o PCSX2 instalado.
+
+    Com um manifesto válido em /game o início a quente é essa leitura mais
+    um stat por arquivo registrado; caso contrário tudo é revalidado (o que
+    sumiu é copiado de novo, executável sumido reinstala o PCSX2) e o
+    manifesto é regravado no final.
+    Retorna o manifesto (ou None se o PCSX2 não pôde ser instalado).
+    """
+    layout = _layout()
+    manifest = load_manifest(layout)
+    if manifest:
+        if status_callback:
+            status_callback("PCSX2 encontrado e pronto.")
+        return manifest
+
     game_dir = get_emulator_path("")
     rom_dir = get_rom_path("")
     cover_dir = get_cover_path("")
 
-    os.makedirs(game_dir, exist_ok=True)
-    os.makedirs(rom_dir, exist_ok=True)
-    os.makedirs(cover_dir, exist_ok=True)
-
     try:
         # === Copiar arquivos padrão ===
         default_src = get_setting_path("default.png")
@@ -33,13 +74,7 @@ def prepare_emulator(progress_callback=None, status_callback=None):
         # === Copiar BIOS → game/bios/
         bios_dir = os.path.join(game_dir, "bios")
         os.makedirs(bios_dir, exist_ok=True)
-        bios_files = [
-            "scph10000-jp.bin",
-            "scph50009-cn.bin",
-            "scph77001-us.bin",
-            "scph77004-eu.bin",
-        ]
-        for bios_name in bios_files:
+        for bios_name in BIOS_FILES:
             bios_src = get_setting_path(bios_name)
             bios_dest = os.path.join(bios_dir, bios_name)
             if os.path.exists(bios_src) and not os.path.exists(bios_dest):
@@ -57,51 +92,178 @@ def prepare_emulator(progress_callback=None, status_callback=None):
         print(f"[WARN] Falha ao copiar arquivos padrão: {e}")
 
     # === Verificar se PCSX2 já existe ===
-    pcsx2_exe = next(
-        (f for f in os.listdir(game_dir) if f.lower().startswith("pcsx2") and f.endswith(".exe")),
-        None,
-    )
-    if pcsx2_exe:
-        if status_callback:
-            status_callback("PCSX2 encontrado e pronto.")
-        return
+    pcsx2_exe = next((f for f in os.listdir(game_dir) if _is_emulator_exe(f)), None)
+    installed = False
+    # Executável com outro tamanho (ex.: PCSX2 atualizado no lugar) é aceito
+    # e o manifesto é regravado; só reinstala quando não há executável
+    if not pcsx2_exe:
+        if not _install_emulator(game_dir, progress_callback, status_callback):
+            return None
+        pcsx2_exe = next((f for f in os.listdir(game_dir) if _is_emulator_exe(f)), None)
+        installed = True
+
+    # === Cria portable.txt ===
+    portable_path = os.path.join(game_dir, "portable.txt")
+    if not os.path.exists(portable_path):
+        open(portable_path, "w").close()
+
+    manifest = _write_install_manifest(layout, game_dir, pcsx2_exe)
 
-    # === Baixar PCSX2 se não estiver presente ===
     if status_callback:
-        status_callback("Baixando PCSX2...")
+        status_callback(
+            "PCSX2 instalado e estrutura pronta ✅" if installed else "PCSX2 encontrado e pronto."
+        )
+    return manifest
+
+
+def _write_install_manifest(layout, game_dir, exe):
+    # Só arquivos que o app não altera depois (PCSX2.ini muda com as configurações)
+    root = get_external_root()
+    paths = [os.path.join(game_dir, exe), os.path.join(game_dir, "portable.txt")]
+    paths += [os.path.join(game_dir, "bios", name) for name in BIOS_FILES]
+    paths.append(os.path.join(get_cover_path(""), "default.png"))
+    files = {}
+    for path in paths:
+        if os.path.exists(path):
+            rel = os.path.relpath(path, root).replace(os.sep, "/")
+            files[rel] = file_entry(path)
+    config = get_config("emulator")
+    return write_manifest(layout, exe, files, {"url": config["url"]})
+
+
+def _install_emulator(game_dir, progress_callback, status_callback):
+    # === Baixar PCSX2 se não estiver presente ===
+    config = get_config("emulator")
+    staging_dir = os.path.join(game_dir, STAGING_DIR)
+    # Restos de uma instalação interrompida nunca chegam a /game
+    shutil.rmtree(staging_dir, ignore_errors=True)
+    os.makedirs(staging_dir, exist_ok=True)
+    archive_path = os.path.join(staging_dir, "pcsx2.7z")
 
-    url = "https://github.com/PCSX2/pcsx2/releases/download/v2.4.0/pcsx2-v2.4.0-windows-x64-Qt.7z"
-    temp_path = os.path.join(game_dir, "pcsx2.7z")
+    def report(fraction):
+        if progress_callback:
+            progress_callback(fraction)
 
     try:
-        with requests.get(url, stream=True) as r:
-            r.raise_for_status()
-            total = int(r.headers.get("content-length", 0))
-            baixado = 0
-            with open(temp_path, "wb") as f:
-                for chunk in r.iter_content(1024 * 256):
-                    if chunk:
-                        f.write(chunk)
-                        baixado += len(chunk)
-                        if progress_callback and total > 0:
-                            progress_callback(baixado / total)
+        if status_callback:
+            status_callback("Baixando PCSX2...")
+        _download_archive(
+            config["url"],
+            archive_path,
+            normalize_expected(config),
+            lambda f: report(f * DOWNLOAD_WEIGHT),
+        )
 
         if status_callback:
             status_callback("Extraindo PCSX2...")
-
-        with py7zr.SevenZipFile(temp_path, mode="r") as z:
-            z.extractall(path=game_dir)
-        os.remove(temp_path)
+        tree_dir = os.path.join(staging_dir, "tree")
+        _extract_selected(
+            archive_path,
+            tree_dir,
+            config["exclude"],
+            lambda f: report(DOWNLOAD_WEIGHT + f * (1 - DOWNLOAD_WEIGHT)),
+        )
+        _swap_in(tree_dir, game_dir)
+        return True
 
     except Exception as e:
         if status_callback:
             status_callback(f"Erro ao baixar PCSX2: {e}")
-        return
-    
-    # === Cria portable.txt ===
-    portable_path = os.path.join(game_dir, "portable.txt")
-    if not os.path.exists(portable_path):
-        open(portable_path, "w").close()
+        return False
+    finally:
+        shutil.rmtree(staging_dir, ignore_errors=True)
 
-    if status_callback:
-        status_callback("PCSX2 instalado e estrutura pronta ✅")
+
+# === Bootstrap do PCSX2: download -> extração seletiva -> troca ===
+def _is_emulator_exe(name):
+    return name.lower().startswith("pcsx2") and name.lower().endswith(".exe")
+
+
+def _download_archive(url, dest, expected, progress):
+    # SHA-1/CRC32 são calculados durante o download; nada é relido depois
+    from services.http_client import get_client
+    from services.transfer import INTERACTIVE, transfer_scheduler
+
+    hasher = StreamHasher()
+    with transfer_scheduler.open(INTERACTIVE) as transfer, get_client().get(url, stream=True) as r:
+        r.raise_for_status()
+        total = int(r.headers.get("content-length", 0))
+        with open(dest, "wb") as f:
+            for chunk in r.iter_content(1024 * 256):
+                if chunk:
+                    f.write(chunk)
+                    hasher.update(chunk)
+                    transfer.throttle(len(chunk))
+                    if total > 0:
+                        progress(hasher.offset / total)
+    if total and hasher.offset != total:
+        raise IOError(f"Download incompleto: {hasher.offset}/{total} bytes")
+    verify_download(dest, hasher, expected)
+
+
+def _extract_selected(archive_path, dest, exclude, progress):
+    """Extrai só o necessário (sem `exclude`), com progresso por byte gravado."""
+    import py7zr
+
+    with py7zr.SevenZipFile(archive_path, mode="r") as z:
+        entries = [
+            info
+            for info in z.list()
+            if not any(fnmatch.fnmatch(info.filename.replace("\\", "/"), p) for p in exclude)
+        ]
+        total = sum(info.uncompressed or 0 for info in entries if not info.is_directory)
+        targets = [info.filename for info in entries]
+
+        # py7zr não reporta progresso: um monitor soma o que já foi gravado
+        done = threading.Event()
+
+        def monitor():
+            while not done.wait(0.2):
+                if total:
+                    progress(min(_tree_size(dest) / total, 1.0))
+
+        watcher = threading.Thread(target=monitor, daemon=True)
+        watcher.start()
+        try:
+            z.extract(path=dest, targets=targets)
+        finally:
+            done.set()
+            watcher.join()
+    progress(1.0)
+
+
+def _tree_size(path):
+    size = 0
+    for root, _dirs, files in os.walk(path):
+        for name in files:
+            try:
+                size += os.path.getsize(os.path.join(root, name))
+            except OSError:
+                pass
+    return size
+
+
+def _merge_tree(src, dst):
+    # Pastas novas entram inteiras com um rename; as existentes são mescladas
+    for name in sorted(os.listdir(src), key=_is_emulator_exe):
+        src_path = os.path.join(src, name)
+        dst_path = os.path.join(dst, name)
+        if os.path.isdir(src_path) and os.path.isdir(dst_path):
+            _merge_tree(src_path, dst_path)
+        else:
+            os.replace(src_path, dst_path)
+
+
+def _swap_in(tree_dir, game_dir):
+    """
+    Move a árvore extraída para /game. O executável vai por último: como a
+    presença dele é o que marca o emulador como instalado, uma queda no meio
+    da troca só faz a próxima inicialização repetir o processo.
+    """
+    entries = os.listdir(tree_dir)
+    # Arquivo com uma única pasta raiz (ex.: pcsx2-v2.4.0/): usa o conteúdo dela
+    if len(entries) == 1 and os.path.isdir(os.path.join(tree_dir, entries[0])):
+        tree_dir = os.path.join(tree_dir, entries[0])
+    if not any(_is_emulator_exe(name) for name in os.listdir(tree_dir)):
+        raise IOError("Executável do PCSX2 não encontrado no pacote.")
+    _merge_tree(tree_dir, game_dir)
@@ -0,0 +1,94 @@
+import builtins
+import os
+import sys
+import time
+
+# === Medição da inicialização ===
+# AX2_IMPORT_REPORT=1  -> imprime o custo acumulado de cada import no início
+# AX2_STARTUP_CHECK=1  -> mede splash/home, confere o orçamento e fecha o app
+#                         (código de saída 1 se estourar; pensado para CI)
+REPORT_ENV = "AX2_IMPORT_REPORT"
+CHECK_ENV = "AX2_STARTUP_CHECK"
+
+_t0 = time.perf_counter()
+_marks = {}
+_import_times = {}
+_original_import = builtins.__import__
+
+
+def _timed_import(name, globals=None, locals=None, fromlist=(), level=0):
+    if level or name in sys.modules:
+        return _original_import(name, globals, locals, fromlist, level)
+    start = time.perf_counter()
+    try:
+        return _original_import(name, globals, locals, fromlist, level)
+    finally:
+        # Tempo acumulado: inclui os imports que este módulo disparou
+        _import_times.setdefault(name, time.perf_counter() - start)
+
+
+def reporting():
+    return bool(os.environ.get(REPORT_ENV) or os.environ.get(CHECK_ENV))
+
+
+def checking():
+    return bool(os.environ.get(CHECK_ENV))
+
+
+def begin():
+    """Chamado no topo do main.py, antes dos imports da interface."""
+    if reporting():
+        builtins.__import__ = _timed_import
+
+
+def elapsed_ms():
+    return (time.perf_counter() - _t0) * 1000
+
+
+def mark(name):
+    """Registra um marco (ex.: "splash", "home") em ms desde o início do processo."""
+    _marks.setdefault(name, elapsed_ms())
+    if reporting():
+        print(f"[STARTUP] {name}: {_marks[name]:.0f} ms")
+
+
+def import_report(limit=15):
+    rows = sorted(_import_times.items(), key=lambda item: item[1], reverse=True)[:limit]
+    lines = ["[STARTUP] imports (acumulado):"]
+    lines += [f"  {seconds * 1000:8.1f} ms  {name}" for name, seconds in rows]
+    return "\n".join(lines)
+
+
+def check_budget():
+    """Compara os marcos com o orçamento do config ("startup"); retorna os estouros."""
+    from utils.config import get_config
+
+    limits = get_config("startup")
+    return [
+        f"{name}: {_marks[name]:.0f} ms > {limit} ms"
+        for name, limit in limits.items()
+        if name in _marks and _marks[name] > limit
+    ]
+
+
+def finish(window):
+    """
+    Chamado quando a tela inicial fica pronta: imprime o relatório de
+    imports e, no modo de checagem, confere o orçamento e encerra o app.
+    """
+    if not reporting():
+        return
+    builtins.__import__ = _original_import
+    print(import_report())
+    if not checking():
+        return
+
+    failures = check_budget()
+    for failure in failures:
+        print(f"[WARN] Orçamento de inicialização estourado: {failure}")
+
+    def stop():
+        window.destroy()
+        sys.exit(1 if failures else 0)
+
+    window.after(0, stop)
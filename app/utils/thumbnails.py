@@ -0,0 +1,128 @@
+import hashlib
+import os
+import threading
+
+from PIL import Image, ImageOps
+
+from .icons import get_asset_image
+from .paths import get_asset_path, get_cache_path, get_cover_path
+
+FRAME_ASSET = "ps1_path.png"
+MAX_CACHE_BYTES = 64 * 1024 * 1024
+
+_lock = threading.Lock()
+_written_since_evict = 0
+
+
+def _thumb_dir():
+    path = get_cache_path("thumbs")
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+def _stat_key(path):
+    st = os.stat(path)
+    return f"{os.path.abspath(path)}:{st.st_mtime_ns}:{st.st_size}"
+
+
+def thumbnail_key(cover_path, frame_path, size):
+    """Chave do card composto: capa (caminho+mtime+tamanho), moldura e tamanho final."""
+    raw = "|".join([_stat_key(cover_path), _stat_key(frame_path), f"{size[0]}x{size[1]}"])
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+
+def compose_card_image(cover_path, size, frame=FRAME_ASSET):
+    width, height = size
+
+    # === Carrega imagens (moldura vem do registro, já no tamanho do card) ===
+    cover = Image.open(cover_path).convert("RGBA")
+    frame = get_asset_image(frame, (width, height))
+
+    margin = 2
+    inner_width = width - (margin * 2)
+    inner_height = height - (margin * 2)
+
+    # Ajusta proporcionalmente mantendo o aspecto
+    cover_fit = ImageOps.contain(cover, (inner_width, inner_height), Image.LANCZOS)
+
+    # Centraliza a capa no espaço total
+    composed = Image.new("RGBA", (width, height), (0, 0, 0, 0))
+    x = (width - cover_fit.width) // 2
+    y = (height - cover_fit.height) // 2
+    composed.paste(cover_fit, (x, y))
+    composed.paste(frame, (0, 0), mask=frame)
+    return composed
+
+
+def get_card_image(image, size=(130, 180), frame=FRAME_ASSET):
+    """
+    Retorna a imagem final do card (capa + moldura) já no tamanho do grid.
+
+    A composição com LANCZOS só acontece no primeiro acesso; depois o PNG
+    pequeno salvo em cache/thumbs é lido direto.
+    """
+    global _written_since_evict
+
+    cover_path = get_cover_path(image)
+    if not os.path.exists(cover_path):
+        cover_path = get_cover_path("default.png")
+
+    frame_path = get_asset_path(frame)
+    if not os.path.exists(frame_path):
+        raise FileNotFoundError(f"Frame not found: {frame_path}")
+
+    thumb_path = os.path.join(_thumb_dir(), thumbnail_key(cover_path, frame_path, size) + ".png")
+
+    try:
+        cached = Image.open(thumb_path)
+        cached.load()
+        os.utime(thumb_path)  # marca como usado recentemente para a evicção
+        return cached
+    except (OSError, ValueError):
+        pass
+
+    composed = compose_card_image(cover_path, size, frame)
+
+    try:
+        tmp_path = f"{thumb_path}.{threading.get_ident()}.tmp"
+        composed.save(tmp_path, "PNG", compress_level=1)
+        os.replace(tmp_path, thumb_path)
+
+        with _lock:
+            _written_since_evict += os.path.getsize(thumb_path)
+            should_evict = _written_since_evict > MAX_CACHE_BYTES // 8
+            if should_evict:
+                _written_since_evict = 0
+        if should_evict:
+            evict_thumbnails()
+    except OSError as e:
+        print(f"[WARN] Falha ao salvar thumbnail: {e}")
+
+    return composed
+
+
+def evict_thumbnails(max_bytes=MAX_CACHE_BYTES):
+    """Remove os thumbnails menos usados até o cache voltar a ~80% do limite."""
+    entries = []
+    total = 0
+    with os.scandir(_thumb_dir()) as it:
+        for entry in it:
+            try:
+                st = entry.stat()
+            except OSError:
+                continue
+            entries.append((st.st_mtime_ns, st.st_size, entry.path))
+            total += st.st_size
+
+    if total <= max_bytes:
+        return
+
+    target = int(max_bytes * 0.8)
+    for _, size, path in sorted(entries):
+        try:
+            os.remove(path)
+            total -= size
+        except OSError:
+            continue
+        if total <= target:
+            break
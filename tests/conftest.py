@@ -0,0 +1,56 @@
+import copy
+import os
+import sys
+import threading
+from http.server import ThreadingHTTPServer
+
+import pytest
+
+# O app importa como `from utils.x import ...` a partir de app/
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "app"))
+
+
+@pytest.fixture
+def external_root(tmp_path, monkeypatch):
+    """Raiz externa (/roms, /covers, /game, /cache) isolada num diretório temporário."""
+    from utils import paths
+
+    monkeypatch.setattr(paths, "get_external_root", lambda: str(tmp_path))
+    return tmp_path
+
+
+@pytest.fixture
+def config(monkeypatch):
+    """Configuração padrão isolada: o teste pode alterar seções sem vazar para os outros."""
+    from utils import config as config_module
+
+    monkeypatch.setattr(config_module, "_config", copy.deepcopy(config_module.DEFAULTS))
+    return config_module.get_config()
+
+
+@pytest.fixture
+def http_server(config, monkeypatch):
+    """
+    Sobe servidores HTTP em 127.0.0.1 (porta livre) com o handler dado e
+    retorna a URL base. O cliente HTTP compartilhado é recriado a cada teste.
+    """
+    from services import http_client
+
+    monkeypatch.setattr(http_client, "_client", None)
+    servers = []
+
+    def start(handler):
+        server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+        server.daemon_threads = True
+        threading.Thread(target=server.serve_forever, args=(0.05,), daemon=True).start()
+        servers.append(server)
+        return f"http://127.0.0.1:{server.server_address[1]}"
+
+    yield start
+
+    client = http_client._client
+    if client is not None:
+        client.session.close()
+    for server in servers:
+        server.shutdown()
+        server.server_close()
@@ -0,0 +1,92 @@
+import json
+from http.server import BaseHTTPRequestHandler
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+from services.catalog import iter_catalog
+from services.catalog_sync import sync_catalog
+
+
+def entry(name):
+    return {"name": name, "game": f"https://example.invalid/{name}.zip", "size": "1 GB"}
+
+
+class CatalogServer(BaseHTTPRequestHandler):
+    """Catálogo versionado: completo, 304 pelo ETag ou delta a partir de `since`."""
+
+    version = 1
+    games = {1: [entry("Crash"), entry("Spyro")], 2: [entry("Crash"), entry("Tekken 3")]}
+    requests = []
+
+    def do_GET(self):
+        query = parse_qs(urlparse(self.path).query)
+        type(self).requests.append({"headers": dict(self.headers), "query": query})
+
+        etag = f'"v{self.version}"'
+        if self.headers.get("If-None-Match") == etag:
+            self.send_response(304)
+            self.end_headers()
+            return
+
+        since = int(query["since"][0]) if "since" in query else None
+        if since is not None and since in self.games:
+            old = {g["name"] for g in self.games[since]}
+            new = {g["name"] for g in self.games[self.version]}
+            payload = {
+                "version": self.version,
+                "base": since,
+                "added": [g for g in self.games[self.version] if g["name"] not in old],
+                "removed": sorted(old - new),
+            }
+        else:
+            payload = {"version": self.version, "games": self.games[self.version]}
+
+        body = json.dumps(payload).encode()
+        self.send_response(200)
+        self.send_header("ETag", etag)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def catalog_url(external_root, http_server, monkeypatch):
+    monkeypatch.setattr(CatalogServer, "version", 1)
+    monkeypatch.setattr(CatalogServer, "requests", [])
+    return http_server(CatalogServer) + "/games.json"
+
+
+def local_names():
+    return sorted(e["name"] for page in iter_catalog() for e in page)
+
+
+def test_unchanged_catalog_answers_304(catalog_url):
+    assert sync_catalog(url=catalog_url) == "full"
+    assert sync_catalog(url=catalog_url) == "unchanged"
+
+    second = CatalogServer.requests[1]
+    assert second["headers"]["If-None-Match"] == '"v1"'
+    assert second["query"] == {"since": ["1"]}
+    assert local_names() == ["Crash", "Spyro"]
+
+
+def test_new_version_is_merged_from_delta(catalog_url):
+    sync_catalog(url=catalog_url)
+    CatalogServer.version = 2
+
+    assert sync_catalog(url=catalog_url) == "delta"
+    assert local_names() == ["Crash", "Tekken 3"]
+    assert sync_catalog(url=catalog_url) == "unchanged"
+    assert CatalogServer.requests[-1]["query"] == {"since": ["2"]}
+
+
+def test_full_sync_sends_no_validators(catalog_url):
+    sync_catalog(url=catalog_url)
+    assert sync_catalog(url=catalog_url, full=True) == "full"
+
+    last = CatalogServer.requests[-1]
+    assert "If-None-Match" not in last["headers"]
+    assert last["query"] == {}
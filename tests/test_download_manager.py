@@ -0,0 +1,102 @@
+import hashlib
+import threading
+import time
+from http.server import BaseHTTPRequestHandler
+
+import pytest
+from services.download import DownloadManager
+
+DATA = bytes(range(256)) * 2048  # 512 KB
+CHUNK = 32 * 1024
+
+
+class SlowServer(BaseHTTPRequestHandler):
+    """Ignora Range (fluxo único) e entrega o arquivo aos poucos."""
+
+    protocol_version = "HTTP/1.1"
+    delay = 0.02
+    requested = []
+
+    def do_GET(self):
+        type(self).requested.append(self.path)
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(DATA)))
+        self.end_headers()
+        try:
+            for start in range(0, len(DATA), CHUNK):
+                self.wfile.write(DATA[start : start + CHUNK])
+                self.wfile.flush()
+                time.sleep(self.delay)
+        except (BrokenPipeError, ConnectionResetError):
+            pass  # cliente cancelou
+
+    def log_message(self, *args):
+        pass
+
+
+class Events:
+    def __init__(self):
+        self.log = []
+        self.finished = {}
+        self._cond = threading.Condition()
+
+    def __call__(self, job, event):
+        with self._cond:
+            self.log.append((job.name, event))
+            if event in ("done", "failed", "cancelled"):
+                self.finished[job.name] = event
+            self._cond.notify_all()
+
+    def wait(self, predicate, timeout=10):
+        with self._cond:
+            assert self._cond.wait_for(lambda: predicate(self), timeout), self.log
+
+
+@pytest.fixture
+def setup(external_root, http_server, config, monkeypatch):
+    monkeypatch.setattr(SlowServer, "requested", [])
+    config["downloads"].update(retries=0, backoff=0, progress_interval=0.01)
+    base = http_server(SlowServer)
+    manager = DownloadManager(parallel=1)
+    events = Events()
+    manager.add_listener(events)
+    return base, manager, events, external_root
+
+
+def submit(manager, base, root, name):
+    expected = {"bytes": len(DATA), "sha1": hashlib.sha1(DATA).hexdigest()}
+    dest = str(root / f"{name}.bin")
+    return manager.submit(name, f"{base}/{name}", dest, expected=expected)
+
+
+def test_queue_runs_jobs_in_order_and_verifies(setup):
+    base, manager, events, root = setup
+    first = submit(manager, base, root, "a")
+    second = submit(manager, base, root, "b")
+
+    events.wait(lambda e: ("a", "started") in e.log)
+    assert second.status == "queued"  # uma vaga só: espera o primeiro terminar
+
+    events.wait(lambda e: len(e.finished) == 2)
+    assert events.finished == {"a": "done", "b": "done"}
+    assert SlowServer.requested == ["/a", "/b"]
+    for job in (first, second):
+        assert job.verified == "verified"
+        assert (root / f"{job.name}.bin").read_bytes() == DATA
+    assert manager.jobs() == []
+
+
+def test_cancel_queued_and_running_jobs(setup):
+    base, manager, events, root = setup
+    running = submit(manager, base, root, "a")
+    queued = submit(manager, base, root, "b")
+
+    assert manager.cancel("b") is queued
+    events.wait(lambda e: running.downloaded > 0)
+    assert manager.cancel("a") is running
+
+    events.wait(lambda e: len(e.finished) == 2)
+    assert events.finished == {"a": "cancelled", "b": "cancelled"}
+    assert SlowServer.requested == ["/a"]  # o cancelado na fila nem chegou a conectar
+    assert not (root / "a.bin").exists()
+    assert not any((root / "cache" / "downloads").iterdir())
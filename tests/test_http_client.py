@@ -0,0 +1,96 @@
+import threading
+import time
+from http.server import BaseHTTPRequestHandler
+
+import pytest
+from services.http_client import HttpClient
+from services.transfer import BULK, INTERACTIVE
+
+BODY = b"x" * 4096
+
+
+class CountingServer(BaseHTTPRequestHandler):
+    """Keep-alive; guarda a porta de origem de cada pedido e o pico de pedidos simultâneos."""
+
+    protocol_version = "HTTP/1.1"
+    delay = 0.0
+    ports = []
+    active = 0
+    peak = 0
+    _lock = threading.Lock()
+
+    def do_GET(self):
+        cls = type(self)
+        with cls._lock:
+            cls.ports.append(self.client_address[1])
+            cls.active += 1
+            cls.peak = max(cls.peak, cls.active)
+        time.sleep(self.delay)
+        with cls._lock:
+            cls.active -= 1
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(BODY)))
+        self.end_headers()
+        self.wfile.write(BODY)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server(http_server, monkeypatch):
+    for name, value in (("ports", []), ("active", 0), ("peak", 0), ("delay", 0.0)):
+        monkeypatch.setattr(CountingServer, name, value)
+    return http_server(CountingServer)
+
+
+def make_client(config, **http):
+    config["http"].update(http)
+    return HttpClient(config["http"])
+
+
+def run_parallel(client, url, count, priority):
+    threads = [
+        threading.Thread(
+            target=lambda: client.get(url, priority=priority).raise_for_status()
+        )
+        for _ in range(count)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(10)
+
+
+def test_sequential_requests_reuse_one_connection(server, config):
+    client = make_client(config)
+    for _ in range(5):
+        with client.get(f"{server}/capa.png", stream=True) as r:
+            assert b"".join(r.iter_content(1024)) == BODY
+
+    assert len(CountingServer.ports) == 5
+    assert len(set(CountingServer.ports)) == 1
+    host = server.removeprefix("http://")
+    assert client.stats()[host]["requests"] == 5
+    assert client.stats()[host]["bytes"] == 5 * len(BODY)
+
+
+def test_per_host_limit_caps_concurrent_requests(server, config):
+    CountingServer.delay = 0.1
+    client = make_client(config, per_host=2)
+    run_parallel(client, f"{server}/rom", 6, priority=INTERACTIVE)
+
+    assert len(CountingServer.ports) == 6
+    assert CountingServer.peak == 2
+    assert len(set(CountingServer.ports)) <= 2  # conexões do pool reaproveitadas
+
+
+def test_bulk_requests_leave_a_slot_for_interactive(server, config):
+    CountingServer.delay = 0.1
+    host = server.removeprefix("http://")
+    client = make_client(config, hosts={host: 3})
+    run_parallel(client, f"{server}/rom", 6, priority=BULK)
+
+    assert CountingServer.peak == 2
+    slot = client._slot(host)
+    assert (slot.limit, slot.in_use, slot.bulk_in_use) == (3, 0, 0)
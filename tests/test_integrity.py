@@ -0,0 +1,42 @@
+import hashlib
+import zlib
+
+import pytest
+from services.integrity import IntegrityError, StreamHasher, verify_download
+
+DATA = bytes(range(256)) * 4096
+
+
+@pytest.fixture
+def rom(tmp_path):
+    path = tmp_path / "game.bin"
+    path.write_bytes(DATA)
+    return str(path)
+
+
+def expected(**extra):
+    return {"bytes": len(DATA), "sha1": hashlib.sha1(DATA).hexdigest(), **extra}
+
+
+def test_partial_hasher_finishes_from_disk(rom):
+    hasher = StreamHasher()
+    hasher.update(DATA[:1000])  # o resto chegou fora de ordem e não foi alcançado
+    assert verify_download(rom, hasher, expected()) == "verified"
+    assert hasher.offset == len(DATA)
+
+
+def test_missing_hasher_rehashes_file(rom):
+    crc32 = f"{zlib.crc32(DATA) & 0xFFFFFFFF:08x}"
+    assert verify_download(rom, None, expected(crc32=crc32)) == "verified"
+
+
+def test_partial_hasher_still_catches_corruption(rom):
+    hasher = StreamHasher()
+    hasher.update(DATA[:1000])
+    with pytest.raises(IntegrityError):
+        verify_download(rom, hasher, expected(sha1="0" * 40))
+
+
+def test_without_catalog_hash_only_size_is_checked(rom):
+    assert verify_download(rom, None, {"bytes": len(DATA)}) == "header"
+    assert verify_download(rom, None, {}) == "unchecked"
@@ -0,0 +1,46 @@
+from services.search import SearchIndex
+
+
+def game(title, cover="default.png"):
+    return {"title": title, "file": f"{title}.iso", "image": cover}
+
+
+def make_index(titles):
+    return SearchIndex(
+        [game(t) for t in titles],
+        ident=lambda g: g["file"],
+        sort_key=lambda g: g["title"].lower(),
+    )
+
+
+def titles(results):
+    return [g["title"] for g in results]
+
+
+def test_remove_drops_item_from_every_search_path():
+    index = make_index(["Crash Bandicoot", "Gran Turismo", "Spyro"])
+    index.remove(["Gran Turismo.iso"])
+
+    assert len(index) == 2
+    assert titles(index.search("")) == ["Crash Bandicoot", "Spyro"]
+    assert index.search("turismo") == []
+    assert index.search("gr") == []
+    assert titles(index.search("sp")) == ["Spyro"]
+
+
+def test_replace_updates_item_in_place():
+    index = make_index(["Crash Bandicoot", "Spyro"])
+    assert index.replace(game("Spyro", cover="Spyro.png"))
+    assert not index.replace(game("Tekken 3"))
+
+    assert index.search("spyro")[0]["image"] == "Spyro.png"
+    assert len(index) == 2
+
+
+def test_added_items_keep_sort_order():
+    index = make_index(["Crash Bandicoot", "Spyro"])
+    index.add([game("Medal of Honor")])
+
+    assert titles(index.search("")) == ["Crash Bandicoot", "Medal of Honor", "Spyro"]
+    assert titles(index.search("o")) == ["Crash Bandicoot", "Medal of Honor", "Spyro"]
+    assert titles(index.search("", limit=2)) == ["Crash Bandicoot", "Medal of Honor"]
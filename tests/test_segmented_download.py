@@ -0,0 +1,103 @@
+import hashlib
+import json
+import re
+import threading
+from http.server import BaseHTTPRequestHandler
+
+import pytest
+from services.download import DownloadManager
+
+DATA = bytes(range(251)) * 4096  # ~1 MB, sem período alinhado aos segmentos
+SEGMENT = 128 * 1024
+_RANGE = re.compile(r"bytes=(\d+)-(\d*)")
+
+
+class RangeServer(BaseHTTPRequestHandler):
+    """Responde Range com 206; `drop_at` derruba a conexão que passar desse byte."""
+
+    protocol_version = "HTTP/1.1"
+    drop_at = None
+    ranges = []
+    _lock = threading.Lock()
+
+    def do_GET(self):
+        match = _RANGE.fullmatch(self.headers.get("Range", ""))
+        start = int(match.group(1)) if match else 0
+        end = int(match.group(2)) if match and match.group(2) else len(DATA) - 1
+        with self._lock:
+            type(self).ranges.append((start, end))
+
+        body = DATA[start : end + 1]
+        self.send_response(206 if match else 200)
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("Content-Range", f"bytes {start}-{end}/{len(DATA)}")
+        self.end_headers()
+
+        drop_at = self.drop_at
+        if drop_at is not None and start < drop_at <= end:
+            body = body[: drop_at - start]
+        try:
+            self.wfile.write(body)
+            self.wfile.flush()
+        except (BrokenPipeError, ConnectionResetError):
+            return  # sondagem fechada logo após os cabeçalhos
+        if drop_at is not None and start < drop_at <= end:
+            self.close_connection = True
+
+    def log_message(self, *args):
+        pass
+
+
+def run_job(manager, url, dest):
+    expected = {"bytes": len(DATA), "sha1": hashlib.sha1(DATA).hexdigest()}
+    finished = threading.Event()
+    result = {}
+
+    def callback(job, event):
+        if event in ("done", "failed", "cancelled"):
+            result["event"] = event
+            finished.set()
+
+    job = manager.submit("jogo", url, dest, callback=callback, expected=expected)
+    assert finished.wait(15)
+    return job, result["event"]
+
+
+@pytest.fixture
+def server(external_root, http_server, config, monkeypatch):
+    monkeypatch.setattr(RangeServer, "ranges", [])
+    config["downloads"].update(
+        retries=0, backoff=0, segments=4, min_segment_size=SEGMENT, chunk_size=16 * 1024
+    )
+    return http_server(RangeServer) + "/jogo.bin"
+
+
+def test_interrupted_download_resumes_from_part(server, external_root, monkeypatch):
+    dest = str(external_root / "roms" / "jogo.bin")
+    (external_root / "roms").mkdir()
+    manager = DownloadManager(parallel=1)
+
+    # Primeira tentativa: a conexão do terceiro segmento cai no meio
+    quarter = len(DATA) // 4
+    monkeypatch.setattr(RangeServer, "drop_at", 2 * quarter + 40 * 1024)
+    job, event = run_job(manager, server, dest)
+    assert event == "failed"
+    with open(job.part_path, encoding="utf-8") as f:
+        segments = json.load(f)["segments"]
+    saved = sum(seg[2] for seg in segments)
+    assert 0 < saved < len(DATA)
+
+    # Segunda: só o que faltava é pedido, e o arquivo final confere
+    monkeypatch.setattr(RangeServer, "drop_at", None)
+    monkeypatch.setattr(RangeServer, "ranges", [])
+    job, event = run_job(manager, server, dest)
+    assert event == "done", job.error
+    assert job.verified == "verified"
+    with open(dest, "rb") as f:
+        assert hashlib.sha1(f.read()).hexdigest() == hashlib.sha1(DATA).hexdigest()
+
+    fetched = sum(end - start + 1 for start, end in RangeServer.ranges[1:])  # sem a sondagem
+    assert fetched == len(DATA) - saved
+    resumed = {seg[0] + seg[2] for seg in segments if seg[2] < seg[1] - seg[0] + 1}
+    assert resumed <= {start for start, _ in RangeServer.ranges[1:]}
+    assert not (external_root / "cache" / "downloads" / "jogo.bin.part").exists()
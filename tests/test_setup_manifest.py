@@ -0,0 +1,39 @@
+import pytest
+from utils import manifest, setup
+
+
+@pytest.fixture
+def external_root(external_root, monkeypatch):
+    # setup e manifest importam get_external_root direto do módulo paths
+    for module in (setup, manifest):
+        monkeypatch.setattr(module, "get_external_root", lambda: str(external_root))
+    return external_root
+
+
+def fail_install(*args):
+    raise AssertionError("PCSX2 não deveria ser reinstalado")
+
+
+def test_emulator_updated_in_place_is_accepted(external_root, monkeypatch):
+    exe = external_root / "game" / "pcsx2-qt.exe"
+    exe.parent.mkdir()
+    exe.write_bytes(b"v1")
+    first = setup.prepare_emulator()
+    assert first["files"]["game/pcsx2-qt.exe"] == {"size": 2}
+
+    # Atualização feita pelo próprio usuário: tamanho muda, manifesto fica velho
+    exe.write_bytes(b"v2 maior")
+    assert manifest.load_manifest(first["layout"]) is None
+
+    monkeypatch.setattr(setup, "_install_emulator", fail_install)
+    second = setup.prepare_emulator()
+    assert second["exe"] == "pcsx2-qt.exe"
+    assert second["files"]["game/pcsx2-qt.exe"] == {"size": len(b"v2 maior")}
+    assert manifest.load_manifest(second["layout"]) == second
+
+
+def test_missing_emulator_is_reinstalled(external_root, monkeypatch):
+    calls = []
+    monkeypatch.setattr(setup, "_install_emulator", lambda *args: calls.append(args) or False)
+    assert setup.prepare_emulator() is None
+    assert len(calls) == 1
@@ -0,0 +1,75 @@
+import importlib.util
+import os
+import subprocess
+import sys
+
+import pytest
+
+APP_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "app")
+
+# Só quando usados: instalar/baixar, tela de controles, atalhos globais
+HEAVY = ("requests", "urllib3", "py7zr", "pygame", "keyboard", "gdown")
+
+# Tudo o que o caminho até a home importa e que não depende de interface
+STARTUP_MODULES = (
+    "utils.startup",
+    "utils.config",
+    "utils.setup",
+    "utils.game",
+    "services.library",
+    "services.search",
+    "services.watcher",
+    "services.session",
+    "services.prewarm",
+    "services.launch_history",
+)
+
+
+def imported_modules(code):
+    """Roda `code` num processo novo com -X importtime; retorna {módulo: quem importou}."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=APP_DIR,
+        capture_output=True,
+        text=True,
+        timeout=60,
+    )
+    assert result.returncode == 0, result.stderr[-2000:]
+
+    # Linhas "import time: self | cumulative | nome"; filhos (mais indentados) vêm antes do pai
+    modules, pending = {}, []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        field = line.rsplit("|", 1)[1]
+        name = field.strip()
+        if name == "package":
+            continue  # cabeçalho
+        depth = len(field) - len(field.lstrip())
+        while pending and pending[-1][0] > depth:
+            modules[pending.pop()[1]] = name
+        modules.setdefault(name, None)
+        pending.append((depth, name))
+    return modules
+
+
+def heavy_in(modules):
+    return {name: parent for name, parent in modules.items() if name.split(".")[0] in HEAVY}
+
+
+def test_startup_services_do_not_import_heavy_modules():
+    modules = imported_modules("; ".join(f"import {name}" for name in STARTUP_MODULES))
+    assert set(STARTUP_MODULES) <= set(modules)
+    assert heavy_in(modules) == {}
+    # Capas e ícones (PIL) só entram com a interface
+    assert not any(name.split(".")[0] == "PIL" for name in modules)
+
+
+@pytest.mark.skipif(
+    importlib.util.find_spec("customtkinter") is None, reason="customtkinter não instalado"
+)
+def test_splash_and_home_do_not_import_heavy_modules():
+    # PIL fica de fora da lista: o próprio customtkinter o importa
+    modules = imported_modules("import main; import ui.home")
+    assert {"main", "ui.init", "ui.home"} <= set(modules)
+    assert heavy_in(modules) == {}
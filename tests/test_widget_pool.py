@@ -0,0 +1,119 @@
+from ui.components.widget_pool import WidgetPool
+
+
+class FakeWidget:
+    def __init__(self, name):
+        self.name = name
+        self.placed = False
+        self.items = []
+
+    def place_forget(self):
+        self.placed = False
+
+
+def make_pool(key=None, release=True):
+    created = []
+    released = []
+
+    def create(parent):
+        widget = FakeWidget(len(created))
+        created.append(widget)
+        return widget
+
+    def bind(widget, item, index):
+        widget.items.append((item, index))
+
+    pool = WidgetPool(create, bind, released.append if release else None, key)
+    return pool, created, released
+
+
+def show(pool, items, wanted):
+    pool.release_outside(wanted)
+    widgets = {}
+    for index in wanted:
+        widget, _ = pool.acquire(index, items[index], parent=None)
+        if pool.move(widget, (0, index)):
+            widget.placed = True
+        widgets[index] = widget
+    return widgets
+
+
+def test_scrolled_out_widget_is_released_and_reused():
+    pool, created, released = make_pool()
+    items = [f"jogo{i}" for i in range(10)]
+
+    first = show(pool, items, range(0, 3))
+    show(pool, items, range(1, 4))
+
+    assert released == [first[0]]
+    assert len(created) == 3  # o widget do índice 0 voltou para o índice 3
+    assert first[0].items[-1] == ("jogo3", 3)
+
+
+def test_released_widget_is_hidden():
+    pool, _, _ = make_pool()
+    widget = show(pool, ["a", "b"], range(0, 1))[0]
+
+    pool.release_outside(range(1, 2))
+
+    assert not widget.placed
+    assert widget not in pool.placed
+
+
+def test_released_widget_is_rebound_even_for_same_item():
+    # O card pode ter cancelado a capa ao sair da tela: precisa religar ao voltar
+    pool, _, _ = make_pool()
+    items = ["a", "b"]
+
+    widget = show(pool, items, range(0, 1))[0]
+    show(pool, items, range(1, 2))
+    show(pool, items, range(0, 1))
+
+    assert [item for item, _ in widget.items].count("a") == 2
+
+
+def test_without_release_hook_same_item_is_not_rebound():
+    pool, _, _ = make_pool(release=False)
+    items = ["a"]
+
+    widget = show(pool, items, range(0, 1))[0]
+    pool.release_outside(range(0))
+    show(pool, items, range(0, 1))
+
+    assert widget.items == [("a", 0)]
+
+
+def test_reconcile_keeps_widgets_by_key_and_releases_removed():
+    pool, _, released = make_pool(key=lambda item: item["file"])
+    items = [{"file": "a", "v": 1}, {"file": "b", "v": 1}, {"file": "c", "v": 1}]
+    widgets = show(pool, items, range(3))
+
+    new_items = [{"file": "c", "v": 1}, {"file": "a", "v": 2}]
+    pool.reconcile(new_items)
+
+    assert pool.bound == {0: widgets[2], 1: widgets[0]}
+    assert released == [widgets[1]]
+    assert widgets[0].items[-1] == ({"file": "a", "v": 2}, 1)  # alterado: religado
+    assert len(widgets[2].items) == 1  # igual: não religa
+
+
+def test_move_only_reports_changed_positions():
+    pool, _, _ = make_pool()
+    widget = FakeWidget("w")
+
+    assert pool.move(widget, (0, 10))
+    assert not pool.move(widget, (0, 10))
+    assert pool.move(widget, (0, 20))
+
+
+def test_reconcile_with_duplicate_keys_leaves_no_ghost_widget():
+    pool, _, released = make_pool(key=lambda item: item["name"])
+    items = [{"name": "Jogo", "region": "us"}, {"name": "Jogo", "region": "eu"}]
+    widgets = show(pool, items, range(2))
+
+    pool.reconcile(items)
+
+    assert len(pool.bound) == 1
+    assert len(released) == 1
+    assert not released[0].placed  # nada fica posicionado fora do controle do grid
+    assert set(pool.bound.values()) | set(released) == set(widgets.values())